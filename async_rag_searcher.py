@@ -0,0 +1,218 @@
+# Async Pain Point RAG Searcher
+# Concurrent fan-out of hybrid and pain point pattern searches over a shared connection pool
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
+from azure.search.documents.models import VectorizedQuery
+
+from azure_ai_search_schema import INDEX_NAME, SEARCH_API_KEY, SEARCH_ENDPOINT, PainPointRAGSearcher
+from search_fields import HYBRID_SEARCH_FIELDS, PAIN_POINT_SEARCH_FIELDS, PAIN_POINT_SEARCH_TEXT_FIELDS
+from vector_compression import VectorCompressionConfig, truncate_embedding, validate_config
+
+DEFAULT_QUERY_TIMEOUT = 5.0  # Seconds allowed per query in a fan-out
+DEFAULT_MAX_CONNECTIONS = 64  # Size of the shared aiohttp connection pool
+
+
+def _result_score(doc: Dict[str, Any]) -> float:
+    """Semantic reranker score when present, otherwise the search score"""
+    score = doc.get("@search.reranker_score")
+    if score is None:
+        score = doc.get("@search.score")
+    return score or 0.0
+
+
+def merge_results(result_lists: List[List[Dict[str, Any]]], top_k: int = None) -> List[Dict[str, Any]]:
+    """Merge result lists, keeping the best-scoring copy of each document"""
+    best: Dict[str, Dict[str, Any]] = {}
+    for results in result_lists:
+        for doc in results:
+            current = best.get(doc["id"])
+            if current is None or _result_score(doc) > _result_score(current):
+                best[doc["id"]] = doc
+
+    merged = sorted(best.values(), key=_result_score, reverse=True)
+    return merged[:top_k] if top_k else merged
+
+
+class AsyncPainPointRAGSearcher:
+    """Asyncio counterpart of PainPointRAGSearcher sharing one HTTP connection pool"""
+
+    # Filter syntax is identical to the sync searcher
+    _build_filter_expression = PainPointRAGSearcher._build_filter_expression
+
+    def __init__(
+        self,
+        endpoint: str = SEARCH_ENDPOINT,
+        api_key: str = SEARCH_API_KEY,
+        index_name: str = INDEX_NAME,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        vector_config: VectorCompressionConfig = None
+    ):
+        self.endpoint = endpoint
+        self.index_name = index_name
+        self.vector_config = validate_config(vector_config or VectorCompressionConfig())
+        self.credential = AzureKeyCredential(api_key)
+        self.max_connections = max_connections
+        self.session = None
+        self.search_client = None
+
+    async def open(self):
+        """Create the pooled session and the async search client"""
+        if self.search_client is not None:
+            return
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+        )
+        self.search_client = AsyncSearchClient(
+            endpoint=self.endpoint,
+            index_name=self.index_name,
+            credential=self.credential,
+            transport=AioHttpTransport(session=self.session, session_owner=False)
+        )
+
+    async def close(self):
+        if self.search_client is not None:
+            await self.search_client.close()
+            self.search_client = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def hybrid_search(
+        self,
+        query: str,
+        query_vector: List[float],
+        filters: Dict[str, Any] = None,
+        top_k: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Perform hybrid search with metadata filtering"""
+        # Query vectors must match the indexed (truncated) dimensions
+        query_vector = truncate_embedding(query_vector, self.vector_config.dimensions)
+
+        results = await self.search_client.search(
+            search_text=query,
+            vector_queries=[VectorizedQuery(
+                vector=query_vector,
+                k_nearest_neighbors=top_k,
+                fields="content_vector"
+            )],
+            filter=self._build_filter_expression(filters) if filters else None,
+            select=HYBRID_SEARCH_FIELDS,
+            top=top_k,
+            query_type="semantic",
+            semantic_configuration_name="semantic-config"
+        )
+        return [doc async for doc in results]
+
+    async def search_by_pain_point_pattern(
+        self,
+        pain_point_keywords: List[str],
+        filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for specific pain point patterns"""
+        search_query = " OR ".join([f'"{keyword}"' for keyword in pain_point_keywords])
+
+        results = await self.search_client.search(
+            search_text=search_query,
+            search_fields=PAIN_POINT_SEARCH_TEXT_FIELDS,
+            filter=self._build_filter_expression(filters) if filters else None,
+            select=PAIN_POINT_SEARCH_FIELDS,
+            top=50
+        )
+        return [doc async for doc in results]
+
+    async def _run_query(self, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "pain_point_keywords" in spec:
+            return await self.search_by_pain_point_pattern(**spec)
+        return await self.hybrid_search(**spec)
+
+    async def fan_out(
+        self,
+        specs: List[Dict[str, Any]],
+        timeout: float = DEFAULT_QUERY_TIMEOUT
+    ) -> List[Any]:
+        """Run queries concurrently; each entry is a result list or the exception it raised
+
+        Specs are keyword arguments for hybrid_search, or for
+        search_by_pain_point_pattern when they contain "pain_point_keywords".
+        """
+        await self.open()
+        tasks = [asyncio.wait_for(self._run_query(spec), timeout) for spec in specs]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def multi_search(
+        self,
+        specs: List[Dict[str, Any]],
+        timeout: float = DEFAULT_QUERY_TIMEOUT,
+        top_k: int = None
+    ) -> List[Dict[str, Any]]:
+        """Fan out several queries and merge their results by best score"""
+        outcomes = await self.fan_out(specs, timeout)
+
+        result_lists = []
+        for spec, outcome in zip(specs, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                print(f"Query timed out after {timeout}s: {spec.get('query') or spec.get('pain_point_keywords')}")
+            elif isinstance(outcome, Exception):
+                print(f"Query failed: {outcome}")
+            else:
+                result_lists.append(outcome)
+
+        return merge_results(result_lists, top_k)
+
+
+def benchmark_against_sync(query_count: int = 8, latency: float = 0.05, repeats: int = 5) -> Dict[str, float]:
+    """Compare serial sync searches with an async fan-out against a local stub server"""
+    from search_service_emulator import SearchServiceEmulator
+
+    vector = [0.1] * 1536
+    specs = [
+        {"query": f"billing issue {i}", "query_vector": vector, "filters": {"customer_tier": "enterprise"}, "top_k": 10}
+        for i in range(query_count)
+    ]
+
+    with SearchServiceEmulator(latency=latency) as stub:
+        stub.seed(INDEX_NAME, [
+            {"id": f"doc-{i}", "content": f"billing issue {i}", "customer_tier": "enterprise", "content_vector": vector}
+            for i in range(50)
+        ])
+        sync_searcher = PainPointRAGSearcher(endpoint=stub.endpoint, credential="stub-key")
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for spec in specs:
+                sync_searcher.hybrid_search(**spec)
+        sync_latency = (time.perf_counter() - start) / repeats
+
+        async def run_async():
+            async with AsyncPainPointRAGSearcher(endpoint=stub.endpoint, api_key="stub-key") as searcher:
+                await searcher.multi_search(specs)  # Warm up the connection pool
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    await searcher.multi_search(specs)
+                return (time.perf_counter() - start) / repeats
+
+        async_latency = asyncio.run(run_async())
+
+    print(f"Per-request latency for {query_count} queries (stub latency {latency * 1000:.0f} ms):")
+    print(f"  • Sync serial:  {sync_latency * 1000:.1f} ms")
+    print(f"  • Async fan-out: {async_latency * 1000:.1f} ms")
+    print(f"  • Speedup: {sync_latency / async_latency:.1f}x")
+    return {"sync_seconds": sync_latency, "async_seconds": async_latency}
+
+
+if __name__ == "__main__":
+    benchmark_against_sync()
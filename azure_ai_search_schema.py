@@ -1,50 +1,143 @@
 # Azure AI Search Content Storage with Metadata Implementation
 # For Pain Point Analysis RAG System
 
-from azure.search.documents import SearchClient
-from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents.indexes.models import (
-    SearchIndex,
-    SimpleField,
-    SearchableField,
-    SearchField,
-    SearchFieldDataType,
-    VectorSearch,
-    HnswAlgorithmConfiguration,
-    VectorSearchProfile,
-    SemanticConfiguration,
-    SemanticPrioritizedFields,
-    SemanticField,
-    SemanticSearch
-)
-from azure.core.credentials import AzureKeyCredential
-from azure.ai.openai import AzureOpenAIClient
+# The search SDK is imported where it is used, so tools that only need the
+# configuration, filters or documents do not pay for loading it
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
-from typing import List, Dict, Any
-import hashlib
+import os
+import threading
+import time
+from typing import List, Dict, Any, Iterable, Iterator
 
-# Configuration
-SEARCH_ENDPOINT = "https://your-search-service.search.windows.net"
-SEARCH_API_KEY = "your-api-key"
-INDEX_NAME = "pain-points-rag-index"
+from batch_retrieval import BatchResult, SearchSpec, print_progress, run_batch
+from customer_resolution import CustomerResolver, ResolvingDocumentBuilder
+from document_builder import DocumentBuilder
+from index_partitioning import (
+    PARTITION_DATE_FIELD,
+    Partition,
+    add_months,
+    cold_index_name,
+    date_bounds,
+    document_partition,
+    find_partitions,
+    merge_partition_facets,
+    merge_partition_results,
+    overlaps,
+    prune_partitions
+)
+from lazy_hits import resolve_select, wrap_hits
+from result_collapsing import COLLAPSE_FIELDS, DEFAULT_DEDUP_THRESHOLD, collapse_by_parent
+from search_cache import SearchResultCache
+from search_filters import compile_filter, normalize_datetime
+from search_pagination import KEYSET_FIELDS, KEYSET_ORDER_BY, MAX_PAGE_SIZE, ResultPage, encode_cursor, keyset_filter
+from search_fields import (
+    DEFAULT_FACETS,
+    FACETABLE_FIELDS,
+    HYBRID_SEARCH_FIELDS,
+    PAIN_POINT_SEARCH_FIELDS,
+    PAIN_POINT_SEARCH_TEXT_FIELDS,
+    RETRIEVABLE_FIELDS,
+    SCORE_FACET_BOUNDARIES
+)
+from hnsw_tuning import resolve_hnsw_parameters
+from vector_compression import VectorCompressionConfig, truncate_embedding, validate_config
+
+# Configuration (environment variables override the placeholders; clients also accept them as arguments)
+SEARCH_ENDPOINT = os.environ.get("AZURE_SEARCH_ENDPOINT", "https://your-search-service.search.windows.net")
+SEARCH_API_KEY = os.environ.get("AZURE_SEARCH_API_KEY", "your-api-key")
+INDEX_NAME = os.environ.get("AZURE_SEARCH_INDEX_NAME", "pain-points-rag-index")
 OPENAI_ENDPOINT = "https://your-openai.openai.azure.com"
 OPENAI_API_KEY = "your-openai-key"
 EMBEDDING_MODEL = "text-embedding-3-large"
 
+def resolve_credential(credential=None):
+    """Accept an API key string or any azure-core credential; defaults to SEARCH_API_KEY"""
+    from azure.core.credentials import AzureKeyCredential
+    
+    if credential is None:
+        credential = SEARCH_API_KEY
+    if isinstance(credential, str):
+        return AzureKeyCredential(credential)
+    return credential
+
+
 class PainPointSearchIndexManager:
     """Manages Azure AI Search index creation and document storage with metadata"""
     
-    def __init__(self):
-        self.credential = AzureKeyCredential(SEARCH_API_KEY)
+    def __init__(
+        self,
+        cache: SearchResultCache = None,
+        vector_config: VectorCompressionConfig = None,
+        hnsw_parameters: Dict[str, Any] = None,
+        endpoint: str = None,
+        credential=None,
+        index_name: str = None,
+        client_options: Dict[str, Any] = None,
+        customer_resolver: CustomerResolver = None,
+        partitioned: bool = False
+    ):
+        from azure.search.documents.indexes import SearchIndexClient
+        
+        self.endpoint = endpoint or SEARCH_ENDPOINT
+        self.index_name = index_name or INDEX_NAME
+        self.credential = resolve_credential(credential)
+        # Extra SDK client keyword arguments, e.g. retry_total or transport
+        self.client_options = client_options or {}
         self.index_client = SearchIndexClient(
-            endpoint=SEARCH_ENDPOINT,
-            credential=self.credential
+            endpoint=self.endpoint,
+            credential=self.credential,
+            **self.client_options
         )
         self.search_client = None
+        self.cache = cache  # Invalidated for the customers touched by each write
+        self.vector_config = validate_config(vector_config or VectorCompressionConfig())
+        # m / ef_construction / ef_search / metric; see hnsw_tuning.py for the sweep harness
+        self.hnsw_parameters = resolve_hnsw_parameters(hnsw_parameters)
+        # Field types come from the schema, so metadata is checked before upload;
+        # the resolver canonicalizes customer_id/customer_name per parent document
+        self.customer_resolver = customer_resolver
+        if customer_resolver is None:
+            self.document_builder = DocumentBuilder.from_index(
+                self.create_index_schema(),
+                vector_dimensions=self.vector_config.dimensions
+            )
+        else:
+            self.document_builder = ResolvingDocumentBuilder.from_index(
+                self.create_index_schema(),
+                vector_dimensions=self.vector_config.dimensions,
+                resolver=customer_resolver
+            )
+        # Monthly partitions: index_name becomes the prefix of one index per
+        # communication_date month (see index_partitioning.py)
+        self.partitioned = partitioned
+        self.cold_before = None  # Months before this were compacted; their writes go to the cold index
+        self._partition_clients: Dict[str, Any] = {}
+        self._partition_lock = threading.Lock()
+        
+    def create_index_schema(self, index_name: str = None, vector_config: VectorCompressionConfig = None):
+        """Create index schema with comprehensive metadata fields for pain point analysis
+        
+        index_name / vector_config override the manager's own, e.g. for a
+        partition or the compressed cold index.
+        """
+        from azure.search.documents.indexes.models import (
+            SearchIndex,
+            SimpleField,
+            SearchableField,
+            SearchField,
+            SearchFieldDataType,
+            VectorSearch,
+            HnswAlgorithmConfiguration,
+            HnswParameters,
+            VectorSearchProfile,
+            SemanticConfiguration,
+            SemanticPrioritizedFields,
+            SemanticField,
+            SemanticSearch
+        )
         
-    def create_index_schema(self):
-        """Create index schema with comprehensive metadata fields for pain point analysis"""
+        vector_config = vector_config or self.vector_config
         
         # Define the fields for the index
         fields = [
@@ -92,7 +185,8 @@ class PainPointSearchIndexManager:
                 name="content_vector",
                 type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
                 searchable=True,
-                vector_search_dimensions=1536,  # For text-embedding-3-large
+                stored=vector_config.store_original_vector,
+                vector_search_dimensions=vector_config.dimensions,  # text-embedding-3-large, truncated
                 vector_search_profile_name="vector-profile"
             ),
             
@@ -137,7 +231,8 @@ class PainPointSearchIndexManager:
                 name="communication_date",
                 type=SearchFieldDataType.DateTimeOffset,
                 filterable=True,
-                sortable=True
+                sortable=True,
+                facetable=True  # Date histograms
             ),
             
             SearchableField(
@@ -196,7 +291,8 @@ class PainPointSearchIndexManager:
                 name="sentiment_score",
                 type=SearchFieldDataType.Double,
                 filterable=True,
-                sortable=True  # -1.0 to 1.0
+                sortable=True,  # -1.0 to 1.0
+                facetable=True
             ),
             
             SimpleField(
@@ -210,7 +306,8 @@ class PainPointSearchIndexManager:
                 name="urgency_score",
                 type=SearchFieldDataType.Double,
                 filterable=True,
-                sortable=True  # 0.0 to 1.0
+                sortable=True,  # 0.0 to 1.0
+                facetable=True
             ),
             
             # Extracted pain points (stored as JSON string)
@@ -224,7 +321,7 @@ class PainPointSearchIndexManager:
             # Tags for flexible categorization
             SearchableField(
                 name="tags",
-                type=SearchFieldDataType.Collection(SearchFieldDataType.String),
+                collection=True,
                 searchable=True,
                 filterable=True,
                 facetable=True
@@ -257,20 +354,17 @@ class PainPointSearchIndexManager:
             algorithms=[
                 HnswAlgorithmConfiguration(
                     name="hnsw-config",
-                    parameters={
-                        "m": 4,  # Number of bi-directional links
-                        "efConstruction": 400,  # Size of dynamic list
-                        "efSearch": 500,  # Size of dynamic list for search
-                        "metric": "cosine"
-                    }
+                    parameters=HnswParameters(**self.hnsw_parameters)
                 )
             ],
             profiles=[
                 VectorSearchProfile(
                     name="vector-profile",
-                    algorithm_configuration_name="hnsw-config"
+                    algorithm_configuration_name="hnsw-config",
+                    compression_name="vector-compression" if vector_config.compression else None
                 )
-            ]
+            ],
+            compressions=self._build_vector_compressions(vector_config)
         )
         
         # Configure semantic search for better relevance
@@ -294,7 +388,7 @@ class PainPointSearchIndexManager:
         
         # Create the index
         index = SearchIndex(
-            name=INDEX_NAME,
+            name=index_name or self.index_name,
             fields=fields,
             vector_search=vector_search,
             semantic_search=semantic_search
@@ -302,19 +396,61 @@ class PainPointSearchIndexManager:
         
         return index
     
+    def _build_vector_compressions(self, vector_config: VectorCompressionConfig = None) -> List[Any]:
+        """Quantization settings for content_vector, if compression is enabled"""
+        from azure.search.documents.indexes.models import (
+            BinaryQuantizationCompression,
+            RescoringOptions,
+            ScalarQuantizationCompression
+        )
+        
+        config = vector_config or self.vector_config
+        if config.compression is None:
+            return []
+        
+        # Full-precision originals are only worth storing when they are used for rescoring
+        rescoring_options = RescoringOptions(
+            enable_rescoring=config.rescore,
+            default_oversampling=config.oversampling if config.rescore else None,
+            rescore_storage_method="preserveOriginals" if config.rescore else "discardOriginals"
+        )
+        
+        if config.compression == "scalar":
+            return [ScalarQuantizationCompression(
+                compression_name="vector-compression",
+                rescoring_options=rescoring_options
+            )]
+        return [BinaryQuantizationCompression(
+            compression_name="vector-compression",
+            rescoring_options=rescoring_options
+        )]
+    
     def create_or_update_index(self):
-        """Create or update the search index"""
+        """Create or update the search index
+        
+        Partitions are created on their first write, so with partitioned=True
+        this only updates the schema of the existing ones.
+        """
+        from azure.search.documents import SearchClient
+        
+        if self.partitioned:
+            for partition in self.list_partitions():
+                self._partition_clients.pop(partition.name, None)
+                self.partition_client(partition.name)
+            return
+        
         index = self.create_index_schema()
         
         try:
             self.index_client.create_or_update_index(index)
-            print(f"Index '{INDEX_NAME}' created/updated successfully")
+            print(f"Index '{self.index_name}' created/updated successfully")
             
             # Initialize search client
             self.search_client = SearchClient(
-                endpoint=SEARCH_ENDPOINT,
-                index_name=INDEX_NAME,
-                credential=self.credential
+                endpoint=self.endpoint,
+                index_name=self.index_name,
+                credential=self.credential,
+                **self.client_options
             )
         except Exception as e:
             print(f"Error creating index: {e}")
@@ -328,186 +464,601 @@ class PainPointSearchIndexManager:
         metadata: Dict[str, Any],
         embedding: List[float]
     ) -> Dict[str, Any]:
-        """Prepare a document with all metadata for indexing"""
-        
-        # Generate unique ID for this chunk
-        chunk_id = hashlib.md5(
-            f"{parent_doc_id}_{chunk_index}_{content[:50]}".encode()
-        ).hexdigest()
+        """Prepare a document with all metadata for indexing
         
-        # Extract pain points (this would be done by your LLM in practice)
-        pain_points = metadata.get("extracted_pain_points", [])
-        
-        # Prepare the document
-        document = {
-            "id": chunk_id,
-            "content": content,
-            "chunk_id": chunk_id,
-            "chunk_index": chunk_index,
-            "parent_document_id": parent_doc_id,
-            "content_vector": embedding,
-            
-            # Customer metadata
-            "customer_id": metadata.get("customer_id"),
-            "customer_name": metadata.get("customer_name"),
-            "customer_tier": metadata.get("customer_tier"),
-            "customer_region": metadata.get("customer_region"),
-            
-            # Communication metadata
-            "communication_type": metadata.get("communication_type"),
-            "communication_date": metadata.get("communication_date"),
-            "subject": metadata.get("subject", ""),
-            "priority": metadata.get("priority", "medium"),
-            
-            # Product metadata
-            "product_id": metadata.get("product_id"),
-            "product_name": metadata.get("product_name"),
-            "product_category": metadata.get("product_category"),
-            
-            # Issue metadata
-            "issue_type": metadata.get("issue_type"),
-            "issue_category": metadata.get("issue_category"),
-            
-            # Sentiment analysis
-            "sentiment_score": metadata.get("sentiment_score", 0.0),
-            "sentiment_label": metadata.get("sentiment_label", "neutral"),
-            "urgency_score": metadata.get("urgency_score", 0.0),
-            
-            # Pain points as JSON string
-            "pain_points": json.dumps(pain_points),
-            
-            # Tags
-            "tags": metadata.get("tags", []),
-            
-            # Processing metadata
-            "processed_date": datetime.utcnow().isoformat(),
-            "processing_version": "1.0",
-            
-            # Additional metadata
-            "metadata_json": json.dumps(metadata.get("additional_metadata", {}))
-        }
+        For many chunks of one parent, document_builder.iter_documents /
+        iter_batch validate and serialize the shared metadata only once.
+        """
+        return self.document_builder.build_one(content, chunk_index, parent_doc_id, metadata, embedding)
+    
+    def partition_client(self, index_name: str, vector_config: VectorCompressionConfig = None):
+        """SearchClient for a partition (or the cold index), creating the index on first use"""
+        from azure.search.documents import SearchClient
         
-        return document
+        with self._partition_lock:
+            client = self._partition_clients.get(index_name)
+            if client is None:
+                self.index_client.create_or_update_index(self.create_index_schema(index_name, vector_config))
+                client = SearchClient(
+                    endpoint=self.endpoint,
+                    index_name=index_name,
+                    credential=self.credential,
+                    **self.client_options
+                )
+                self._partition_clients[index_name] = client
+            return client
+    
+    def list_partitions(self) -> List[Partition]:
+        """Existing monthly partitions, oldest first"""
+        return find_partitions(self.index_name, self.index_client.list_index_names())
+    
+    def document_index(self, document: Dict[str, Any]) -> str:
+        """Partition a document is written to, or the cold index once its month has been compacted"""
+        index_name = document_partition(self.index_name, document)
+        cold_before = self.cold_before
+        if cold_before is not None and normalize_datetime(document[PARTITION_DATE_FIELD]) < cold_before:
+            return cold_index_name(self.index_name)
+        return index_name
     
     def index_documents(self, documents: List[Dict[str, Any]]):
-        """Index multiple documents with metadata"""
+        """Index multiple documents with metadata
+        
+        With partitioned=True each document goes to the partition of its
+        communication_date month, or to the cold index for compacted months.
+        """
         try:
-            result = self.search_client.upload_documents(documents=documents)
+            if self.partitioned:
+                routed: Dict[str, List[Dict[str, Any]]] = {}
+                for document in documents:
+                    routed.setdefault(self.document_index(document), []).append(document)
+                result = []
+                for index_name, partition_documents in routed.items():
+                    result += self.partition_client(index_name).upload_documents(documents=partition_documents)
+            else:
+                result = self.search_client.upload_documents(documents=documents)
             print(f"Indexed {len(documents)} documents")
+            if self.cache is not None:
+                self.cache.invalidate_customers(doc.get("customer_id") for doc in documents)
             return result
         except Exception as e:
             print(f"Error indexing documents: {e}")
             raise
+    
+    def index_document_stream(self, documents: Iterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Upload a lazily built document stream in batches; returns the number indexed"""
+        indexed = 0
+        batch = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) == batch_size:
+                self.index_documents(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            self.index_documents(batch)
+            indexed += len(batch)
+        return indexed
+    
+    def compact_partitions(
+        self,
+        before: datetime,
+        cold_vector_config: VectorCompressionConfig = None,
+        batch_size: int = 1000,
+        max_copy_passes: int = 3
+    ) -> Dict[str, int]:
+        """Move the partitions of months before `before` into the compressed cold index
+        
+        The cold index defaults to binary quantization with rescoring and no
+        retrievable vector copy. Each partition is copied in keyset order and
+        deleted only once every document has been uploaded. From the start of
+        compaction this manager writes documents of those months to the cold
+        index, and its cache is invalidated after each partition is deleted,
+        since cached hits name the partition they came from.
+        
+        Writes from other processes are not fenced. The partition's document
+        count is re-checked after each copy pass, but Azure AI Search counts
+        are eventually consistent, so this is a best-effort check: a write
+        landing just before the delete can be lost. Stop other writers to
+        these months before compacting them.
+        Returns the number of documents moved per partition.
+        """
+        if not self.partitioned:
+            raise ValueError("compact_partitions requires a partitioned index manager")
+        if not self.vector_config.store_original_vector:
+            raise ValueError("Partition vectors are not retrievable (store_original_vector=False), so they cannot be copied")
+        cold_config = validate_config(cold_vector_config or self.vector_config._replace(
+            compression="binary",
+            rescore=True,
+            store_original_vector=False
+        ))
+        if cold_config.dimensions != self.vector_config.dimensions:
+            raise ValueError("The cold index must use the partitions' vector dimensions")
+        
+        cutoff = add_months(normalize_datetime(before), 0)  # Only whole months are moved
+        cold_client = self.partition_client(cold_index_name(self.index_name), cold_config)
+        with self._partition_lock:
+            if self.cold_before is None or cutoff > self.cold_before:
+                self.cold_before = cutoff  # Stop writing to the months being compacted
+        copy_fields = RETRIEVABLE_FIELDS + ["content_vector"]
+        moved = {}
+        
+        for partition in self.list_partitions():
+            if partition.end > cutoff:
+                continue
+            source_client = self.partition_client(partition.name)
+            reader = PainPointRAGSearcher(search_client=source_client)
+            for _ in range(max_copy_passes):
+                copied = 0
+                for page in reader.iter_result_pages(select=copy_fields, page_size=batch_size):
+                    documents = [
+                        {field: value for field, value in doc.items() if not field.startswith("@")}
+                        for doc in page.documents
+                    ]
+                    failed = [result.key for result in cold_client.upload_documents(documents=documents)
+                              if not result.succeeded]
+                    if failed:
+                        raise RuntimeError(f"Compacting '{partition.name}' failed for {len(failed)} documents, e.g. {failed[0]}")
+                    copied += len(documents)
+                
+                # Uploads are idempotent, so a partition seen changing during the copy is simply copied again
+                if source_client.get_document_count() == copied:
+                    break
+            else:
+                raise RuntimeError(f"'{partition.name}' kept changing during {max_copy_passes} copy passes; not deleted")
+            
+            self.index_client.delete_index(partition.name)
+            with self._partition_lock:
+                self._partition_clients.pop(partition.name, None)
+            if self.cache is not None:
+                self.cache.invalidate_index(self.index_name)
+            moved[partition.name] = copied
+        
+        return moved
 
 
 class PainPointRAGSearcher:
     """Handles searching and retrieval from the pain point index"""
     
-    def __init__(self):
-        self.credential = AzureKeyCredential(SEARCH_API_KEY)
-        self.search_client = SearchClient(
-            endpoint=SEARCH_ENDPOINT,
-            index_name=INDEX_NAME,
-            credential=self.credential
-        )
+    def __init__(
+        self,
+        cache: SearchResultCache = None,
+        vector_config: VectorCompressionConfig = None,
+        search_client=None,
+        endpoint: str = None,
+        credential=None,
+        index_name: str = None,
+        client_options: Dict[str, Any] = None,
+        partitioned: bool = False,
+        partition_refresh: float = 300.0,
+        max_partition_concurrency: int = 8
+    ):
+        self.endpoint = endpoint or SEARCH_ENDPOINT
+        self.index_name = index_name or INDEX_NAME
+        self.credential = resolve_credential(credential)
+        self.client_options = client_options or {}
+        # Any object with SearchClient.search semantics, e.g. a fake in tests
+        self.search_client = search_client
+        if search_client is None:
+            from azure.search.documents import SearchClient
+            
+            self.search_client = SearchClient(
+                endpoint=self.endpoint,
+                index_name=self.index_name,
+                credential=self.credential,
+                **self.client_options
+            )
+        self.cache = cache
+        self.vector_config = validate_config(vector_config or VectorCompressionConfig())
+        
+        # Monthly partitions written by a partitioned PainPointSearchIndexManager:
+        # hybrid_search, search_by_pain_point_pattern and facet_counts prune
+        # them by the communication_date filters and query the rest in
+        # parallel; iter_result_pages reads them one after another. The
+        # partition list is reloaded every partition_refresh seconds.
+        self.partitioned = partitioned
+        self.partition_refresh = partition_refresh
+        self.max_partition_concurrency = max_partition_concurrency
+        self.index_client = None
+        if partitioned:
+            from azure.search.documents.indexes import SearchIndexClient
+            
+            self.index_client = SearchIndexClient(
+                endpoint=self.endpoint,
+                credential=self.credential,
+                **self.client_options
+            )
+        self._partition_clients: Dict[str, Any] = {}
+        self._partition_state = None  # (loaded at, hot partitions, (cold index, oldest, newest) or None)
+        self._partition_lock = threading.Lock()
     
     def hybrid_search(
         self,
         query: str,
         query_vector: List[float],
         filters: Dict[str, Any] = None,
-        top_k: int = 20
+        top_k: int = 20,
+        profile="summary",
+        lazy: bool = False
     ) -> List[Dict[str, Any]]:
-        """Perform hybrid search with metadata filtering"""
+        """Perform hybrid search with metadata filtering
+        
+        profile is a field profile name ("ids", "summary", "full") or a
+        list of fields. With lazy=True hits are LazySearchHit objects that
+        fetch unselected fields in one batched lookup on first access and
+        decode pain_points / metadata_json only when read.
+        """
+        select = resolve_select(profile)
+        
+        # Query vectors must match the indexed (truncated) dimensions
+        query_vector = truncate_embedding(query_vector, self.vector_config.dimensions)
+        
+        # Serve repeated queries from the cache
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(query, query_vector, filters, top_k, select, index_name=self.index_name)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._wrap_lazy(cached, select) if lazy else cached
         
         # Build filter expression
         filter_expr = self._build_filter_expression(filters) if filters else None
         
         # Perform hybrid search
-        results = self.search_client.search(
+        if self.partitioned:
+            documents = self._search_partitions(query, query_vector, filters, filter_expr, select, top_k)
+        else:
+            documents = self._run_hybrid_search(self.search_client, query, query_vector, filter_expr, select, top_k)
+        
+        if self.cache is not None:
+            self.cache.set(cache_key, documents)
+        return self._wrap_lazy(documents, select) if lazy else documents
+    
+    def _run_hybrid_search(self, search_client, query, query_vector, filter_expr, select, top_k) -> List[Dict[str, Any]]:
+        from azure.search.documents.models import VectorizedQuery
+        
+        results = search_client.search(
             search_text=query,
-            vector_queries=[{
-                "vector": query_vector,
-                "k_nearest_neighbors": top_k,
-                "fields": "content_vector"
-            }],
+            vector_queries=[VectorizedQuery(
+                vector=query_vector,
+                k_nearest_neighbors=top_k,
+                fields="content_vector"
+            )],
             filter=filter_expr,
-            select=[
-                "id", "content", "customer_id", "customer_name", 
-                "customer_tier", "product_name", "issue_type",
-                "sentiment_label", "pain_points", "communication_date",
-                "subject", "priority", "tags"
-            ],
+            select=select,
             top=top_k,
             query_type="semantic",
             semantic_configuration_name="semantic-config"
         )
-        
         return [doc for doc in results]
     
-    def _build_filter_expression(self, filters: Dict[str, Any]) -> str:
-        """Build OData filter expression from filter dictionary"""
-        filter_parts = []
+    def _partition_client(self, index_name: str):
+        client = self._partition_clients.get(index_name)
+        if client is None:
+            from azure.search.documents import SearchClient
+            
+            client = self._partition_clients.setdefault(index_name, SearchClient(
+                endpoint=self.endpoint,
+                index_name=index_name,
+                credential=self.credential,
+                **self.client_options
+            ))
+        return client
+    
+    def refresh_partitions(self):
+        """Reload the partition list and the date span of the cold index"""
+        names = set(self.index_client.list_index_names())
+        hot = find_partitions(self.index_name, names)
+        cold = None
+        cold_name = cold_index_name(self.index_name)
+        if cold_name in names:
+            client = self._partition_client(cold_name)
+            span = [
+                [doc for doc in client.search(
+                    search_text="*",
+                    filter="communication_date ne null",
+                    select=["communication_date"],
+                    order_by=[f"communication_date {direction}"],
+                    top=1
+                )]
+                for direction in ("asc", "desc")
+            ]
+            if span[0]:
+                cold = (cold_name, normalize_datetime(span[0][0]["communication_date"]),
+                        normalize_datetime(span[1][0]["communication_date"]))
+        self._partition_state = (time.monotonic(), hot, cold)
+    
+    def indexes_for(self, filters: Dict[str, Any] = None) -> List[str]:
+        """Partition (and cold) indexes that can hold documents matching the date filters"""
+        with self._partition_lock:
+            state = self._partition_state
+            if state is None or time.monotonic() - state[0] > self.partition_refresh:
+                self.refresh_partitions()
+            _, hot, cold = self._partition_state
         
-        # Customer filters
-        if "customer_id" in filters:
-            filter_parts.append(f"customer_id eq '{filters['customer_id']}'")
+        lower, upper = date_bounds(filters)
+        index_names = [partition.name for partition in prune_partitions(hot, lower, upper)]
+        if cold is not None and overlaps(cold[1:], lower, upper):
+            index_names.append(cold[0])
+        return index_names
+    
+    def _fan_out(self, filters: Dict[str, Any], search) -> Dict[str, Any]:
+        """Run search(client) in parallel on every partition the date filters allow, keyed by index name"""
+        from azure.core.exceptions import ResourceNotFoundError
         
-        if "customer_tier" in filters:
-            if isinstance(filters["customer_tier"], list):
-                tier_filters = " or ".join([f"customer_tier eq '{tier}'" for tier in filters["customer_tier"]])
-                filter_parts.append(f"({tier_filters})")
-            else:
-                filter_parts.append(f"customer_tier eq '{filters['customer_tier']}'")
+        for attempt in range(2):
+            index_names = self.indexes_for(filters)
+            if not index_names:
+                return {}
+            try:
+                with ThreadPoolExecutor(max_workers=min(len(index_names), self.max_partition_concurrency)) as executor:
+                    futures = {
+                        index_name: executor.submit(search, self._partition_client(index_name))
+                        for index_name in index_names
+                    }
+                    return {index_name: future.result() for index_name, future in futures.items()}
+            except ResourceNotFoundError:
+                if attempt:
+                    raise
+                self._partition_state = None  # A partition was compacted away; reload and retry once
+    
+    def _search_partitions(self, query, query_vector, filters, filter_expr, select, top_k) -> List[Dict[str, Any]]:
+        """Fan a hybrid search out to the relevant partitions and merge by normalized score"""
+        results = self._fan_out(
+            filters,
+            lambda client: self._run_hybrid_search(client, query, query_vector, filter_expr, select, top_k)
+        )
+        return merge_partition_results(results, top_k)
+    
+    def _wrap_lazy(self, documents: List[Dict[str, Any]], select: List[str]):
+        """Lazy hits, hydrated from the index (partition) each hit came from"""
+        if not self.partitioned:
+            return wrap_hits(documents, self.search_client, select)
+        
+        positions: Dict[str, List[int]] = {}
+        for position, doc in enumerate(documents):
+            positions.setdefault(doc["@search.partition"], []).append(position)
+        hits = [None] * len(documents)
+        for index_name, group in positions.items():
+            wrapped = wrap_hits([documents[position] for position in group], self._partition_client(index_name), select)
+            for position, hit in zip(group, wrapped):
+                hits[position] = hit
+        return hits
+    
+    def search_distinct_documents(
+        self,
+        query: str,
+        query_vector: List[float],
+        filters: Dict[str, Any] = None,
+        top_k: int = 10,
+        overfetch: int = 3,
+        max_rounds: int = 2,
+        merge_adjacent: bool = True,
+        dedup_threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        profile="summary"
+    ) -> List[Dict[str, Any]]:
+        """Hybrid search returning up to top_k distinct parent documents
+        
+        Fetches top_k * overfetch chunks, keeps the best chunk per
+        parent_document_id (merged with adjacent retrieved chunks) and drops
+        near-duplicate content. If that leaves fewer than top_k documents,
+        another round excludes the parents already seen.
+        """
+        select = resolve_select(profile)
+        select += [field for field in COLLAPSE_FIELDS if field not in select]
+        
+        documents: List[Dict[str, Any]] = []
+        seen_parents: List[str] = []
+        seen_shingles: List[Any] = []
+        
+        # Keep the caller's own parent exclusions alongside the parents already seen
+        excluded = (filters or {}).get("parent_document_id_not")
+        if excluded is None:
+            excluded = []
+        elif isinstance(excluded, str):
+            excluded = [excluded]
+        
+        for _ in range(max_rounds):
+            round_filters = dict(filters or {})
+            if seen_parents:
+                round_filters["parent_document_id_not"] = list(dict.fromkeys([*excluded, *seen_parents]))
+            
+            hits = self.hybrid_search(query, query_vector, round_filters, top_k * overfetch, profile=select)
+            documents += collapse_by_parent(
+                hits,
+                top_k - len(documents),
+                merge_adjacent=merge_adjacent,
+                dedup_threshold=dedup_threshold,
+                seen_shingles=seen_shingles
+            )
+            seen_parents += list(dict.fromkeys(hit.get("parent_document_id") or hit["id"] for hit in hits))
+            
+            if len(documents) >= top_k or len(hits) < top_k * overfetch:
+                break
         
-        # Date range filter
-        if "date_from" in filters:
-            filter_parts.append(f"communication_date ge {filters['date_from'].isoformat()}")
+        return documents
+    
+    def batch_search(
+        self,
+        specs: List[SearchSpec],
+        max_concurrency: int = 8,
+        requests_per_second: float = None,
+        progress=print_progress,
+        progress_every: int = 100
+    ) -> Iterator[BatchResult]:
+        """Run many hybrid searches, streaming results back as they complete
         
-        if "date_to" in filters:
-            filter_parts.append(f"communication_date le {filters['date_to'].isoformat()}")
+        specs are SearchSpec(query, query_vector, filters, top_k) tuples.
+        Identical specs run once; each BatchResult lists every position it
+        answers. Failed queries are reported through BatchResult.error.
+        """
+        return run_batch(
+            self.hybrid_search,
+            specs,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            progress=progress,
+            progress_every=progress_every
+        )
+    
+    def facet_counts(
+        self,
+        facets: List[str] = None,
+        filters: Dict[str, Any] = None,
+        query: str = "*",
+        top: int = 10,
+        date_interval: str = "month",
+        score_boundaries: Dict[str, List[float]] = None
+    ) -> Dict[str, Any]:
+        """Count documents per facet value without retrieving any documents
         
-        # Product filter
-        if "product_id" in filters:
-            filter_parts.append(f"product_id eq '{filters['product_id']}'")
+        String fields return their top-N values, sentiment_score and
+        urgency_score return range buckets, and communication_date returns a
+        histogram at date_interval (day, week, month, quarter, year).
+        Partitioned searchers sum the counts of every partition searched.
+        """
+        boundaries = {**SCORE_FACET_BOUNDARIES, **(score_boundaries or {})}
+        
+        facet_specs = []
+        ranked_fields = []
+        for field in facets or DEFAULT_FACETS:
+            if field not in FACETABLE_FIELDS:
+                raise ValueError(f"Field '{field}' is not facetable")
+            if field in boundaries:
+                facet_specs.append(f"{field},values:{'|'.join(str(b) for b in boundaries[field])}")
+            elif field == "communication_date":
+                facet_specs.append(f"{field},interval:{date_interval}")
+            else:
+                facet_specs.append(f"{field},count:{top}")
+                ranked_fields.append(field)
         
-        # Issue type filter
-        if "issue_type" in filters:
-            filter_parts.append(f"issue_type eq '{filters['issue_type']}'")
+        filter_expr = self._build_filter_expression(filters) if filters else None
         
-        # Sentiment filter
-        if "sentiment_label" in filters:
-            filter_parts.append(f"sentiment_label eq '{filters['sentiment_label']}'")
+        def count(search_client):
+            results = search_client.search(
+                search_text=query,
+                filter=filter_expr,
+                facets=facet_specs,
+                include_total_count=True,
+                top=0
+            )
+            return results.get_count() or 0, results.get_facets() or {}
         
-        # Priority filter
-        if "priority" in filters:
-            filter_parts.append(f"priority eq '{filters['priority']}'")
+        if not self.partitioned:
+            total_count, facet_results = count(self.search_client)
+            return {"total_count": total_count, "facets": facet_results}
         
-        # Combine all filters with AND
-        return " and ".join(filter_parts) if filter_parts else None
+        counted = list(self._fan_out(filters, count).values())
+        return {
+            "total_count": sum(total_count for total_count, _ in counted),
+            "facets": merge_partition_facets((facet_results for _, facet_results in counted), top, ranked_fields)
+        }
+    
+    def _build_filter_expression(self, filters: Dict[str, Any]) -> str:
+        """Build OData filter expression from filter dictionary"""
+        return compile_filter(filters)
     
     def search_by_pain_point_pattern(
         self,
         pain_point_keywords: List[str],
-        filters: Dict[str, Any] = None
+        filters: Dict[str, Any] = None,
+        top: int = 50
     ) -> List[Dict[str, Any]]:
         """Search for specific pain point patterns"""
         
         # Build search query from pain point keywords
         search_query = " OR ".join([f'"{keyword}"' for keyword in pain_point_keywords])
+        filter_expr = self._build_filter_expression(filters) if filters else None
         
-        results = self.search_client.search(
-            search_text=search_query,
-            search_fields=["content", "pain_points", "tags"],
-            filter=self._build_filter_expression(filters) if filters else None,
-            select=[
-                "id", "content", "customer_tier", "product_name",
-                "pain_points", "sentiment_score", "urgency_score"
-            ],
-            top=50
-        )
+        def search(search_client):
+            results = search_client.search(
+                search_text=search_query,
+                search_fields=PAIN_POINT_SEARCH_TEXT_FIELDS,
+                filter=filter_expr,
+                select=PAIN_POINT_SEARCH_FIELDS,
+                top=top
+            )
+            return [doc for doc in results]
         
-        return [doc for doc in results]
+        if self.partitioned:
+            return merge_partition_results(self._fan_out(filters, search), top)
+        return search(self.search_client)
+    
+    def iter_result_pages(
+        self,
+        query: str = "*",
+        filters: Dict[str, Any] = None,
+        select: List[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        cursor: str = None
+    ) -> Iterator[ResultPage]:
+        """Stream every matching document page by page in (communication_date, id) order
+        
+        Pages are fetched with keyset range filters rather than skip, so cost
+        per page stays flat however deep the export goes. Each page carries
+        a cursor; pass it back as `cursor` to resume after that page.
+        
+        Partitioned searchers read the cold index and then the hot partitions
+        oldest first. Months never share an index and compaction only moves
+        months older than every hot partition, so the order holds across
+        indexes and one cursor resumes anywhere; a page can come up short
+        where one index ends.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        select = list(select or HYBRID_SEARCH_FIELDS)
+        select += [field for field in KEYSET_FIELDS if field not in select]
+        base_filter = self._build_filter_expression(filters) if filters else None
+        
+        if not self.partitioned:
+            yield from self._iter_index_pages(self.search_client, query, base_filter, select, page_size, cursor)
+            return
+        
+        from azure.core.exceptions import ResourceNotFoundError
+        
+        cold_name = cold_index_name(self.index_name)
+        for attempt in range(2):
+            index_names = sorted(self.indexes_for(filters), key=lambda index_name: index_name != cold_name)
+            try:
+                for index_name in index_names:
+                    client = self._partition_client(index_name)
+                    for page in self._iter_index_pages(client, query, base_filter, select, page_size, cursor):
+                        cursor = page.cursor
+                        yield page
+                return
+            except ResourceNotFoundError:
+                if attempt:
+                    raise
+                self._partition_state = None  # Compacted away mid-export; its documents are now in the cold index
+    
+    def _iter_index_pages(self, search_client, query, base_filter, select, page_size, cursor) -> Iterator[ResultPage]:
+        while True:
+            filter_parts = [part for part in (base_filter, keyset_filter(cursor) if cursor else None) if part]
+            results = search_client.search(
+                search_text=query,
+                filter=" and ".join(f"({part})" for part in filter_parts) or None,
+                select=select,
+                order_by=KEYSET_ORDER_BY,
+                top=page_size
+            )
+            documents = [doc for doc in results]
+            if not documents:
+                return
+            
+            cursor = encode_cursor(documents[-1])
+            yield ResultPage(documents, cursor)
+            if len(documents) < page_size:
+                return
+    
+    def iter_search_results(
+        self,
+        query: str = "*",
+        filters: Dict[str, Any] = None,
+        select: List[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        cursor: str = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream matching documents one at a time with bounded memory"""
+        for page in self.iter_result_pages(query, filters, select, page_size, cursor):
+            yield from page.documents
 
 
 # Example usage
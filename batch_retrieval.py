@@ -0,0 +1,133 @@
+# Batched Retrieval
+# Deduplicated, rate-limited, bounded-concurrency execution of many search specs
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from search_cache import canonical_filters, hash_vector, normalize_query
+
+
+class SearchSpec(NamedTuple):
+    """One hybrid_search call in a batch"""
+    query: str
+    query_vector: List[float]
+    filters: Optional[Dict[str, Any]] = None
+    top_k: int = 20
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a unique spec, reported for every position it occupied in the batch"""
+    spec_indexes: List[int]
+    spec: SearchSpec
+    results: Optional[List[Dict[str, Any]]]
+    error: Optional[Exception] = None
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per second with bursts of `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+def spec_key(spec: SearchSpec) -> tuple:
+    """Identity of a spec for deduplication (same normalization as the result cache)"""
+    return (
+        normalize_query(spec.query),
+        hash_vector(spec.query_vector),
+        canonical_filters(spec.filters),
+        spec.top_k
+    )
+
+
+def print_progress(completed: int, total: int, elapsed: float):
+    rate = completed / elapsed if elapsed else 0.0
+    print(f"Completed {completed:,}/{total:,} unique queries ({rate:,.1f} queries/sec)")
+
+
+def run_batch(
+    search_fn: Callable[..., List[Dict[str, Any]]],
+    specs: List[SearchSpec],
+    max_concurrency: int = 8,
+    requests_per_second: float = None,
+    progress: Callable[[int, int, float], None] = print_progress,
+    progress_every: int = 100
+) -> Iterator[BatchResult]:
+    """Run specs through search_fn and yield results in completion order
+
+    Identical specs are executed once and reported with all of their
+    positions. At most max_concurrency calls are in flight, and submissions
+    are throttled to requests_per_second when given. A spec that cannot be
+    keyed (e.g. an invalid filter) is reported with its error up front
+    instead of aborting the batch.
+    """
+    groups: Dict[tuple, List[int]] = {}
+    unique_specs: Dict[tuple, SearchSpec] = {}
+    for position, spec in enumerate(specs):
+        spec = SearchSpec(*spec) if not isinstance(spec, SearchSpec) else spec
+        try:
+            key = spec_key(spec)
+        except Exception as error:
+            yield BatchResult(spec_indexes=[position], spec=spec, results=None, error=error)
+            continue
+        groups.setdefault(key, []).append(position)
+        unique_specs.setdefault(key, spec)
+
+    limiter = RateLimiter(requests_per_second, burst=max_concurrency) if requests_per_second else None
+    pending_keys = iter(unique_specs)
+    total = len(unique_specs)
+    completed = 0
+    start = time.perf_counter()
+
+    def call(spec: SearchSpec):
+        if limiter is not None:
+            limiter.acquire()
+        return search_fn(spec.query, spec.query_vector, filters=spec.filters, top_k=spec.top_k)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        in_flight = {}
+
+        def submit_next() -> bool:
+            key = next(pending_keys, None)
+            if key is None:
+                return False
+            in_flight[executor.submit(call, unique_specs[key])] = key
+            return True
+
+        while len(in_flight) < max_concurrency and submit_next():
+            pass
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = in_flight.pop(future)
+                error = future.exception()
+                yield BatchResult(
+                    spec_indexes=groups[key],
+                    spec=unique_specs[key],
+                    results=None if error else future.result(),
+                    error=error
+                )
+
+                completed += 1
+                if progress and (completed % progress_every == 0 or completed == total):
+                    progress(completed, total, time.perf_counter() - start)
+                submit_next()
@@ -0,0 +1,237 @@
+# Bulk Document Builder
+# Schema-driven construction of index documents, validating metadata once per parent document
+
+import hashlib
+import json
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from search_filters import DATETIME, DOUBLE, FILTERABLE_FIELDS, INT32, STRING, STRING_COLLECTION, normalize_datetime
+from vector_compression import truncate_embedding
+
+try:
+    import orjson
+
+    def _dumps(value) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:
+    def _dumps(value) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+PROCESSING_VERSION = "1.0"
+
+# Metadata-backed fields and their types (schema fields outside the filterable set added here)
+METADATA_FIELD_TYPES = {**FILTERABLE_FIELDS, "subject": STRING}
+
+# Fields filled per chunk or from dedicated metadata keys, never copied from metadata
+DERIVED_FIELDS = {
+    "id", "content", "chunk_id", "chunk_index", "parent_document_id", "content_vector",
+    "pain_points", "metadata_json", "processed_date", "processing_version"
+}
+
+FIELD_DEFAULTS = {
+    "subject": "",
+    "priority": "medium",
+    "sentiment_score": 0.0,
+    "sentiment_label": "neutral",
+    "urgency_score": 0.0,
+    "tags": []
+}
+
+# (chunk_index, content, embedding) with optional per-chunk additional_metadata
+ChunkInput = Tuple[Any, ...]
+
+
+def _validate(field: str, field_type: str, value):
+    if value is None:
+        return None
+    if field_type == STRING:
+        if not isinstance(value, str):
+            raise TypeError(f"Metadata '{field}' must be a string, got {type(value).__name__}")
+        return value
+    if field_type == STRING_COLLECTION:
+        if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+            raise TypeError(f"Metadata '{field}' must be a list of strings")
+        return list(value)
+    if field_type in (DOUBLE, INT32):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"Metadata '{field}' must be a number, got {type(value).__name__}")
+        return float(value) if field_type == DOUBLE else int(value)
+    if field_type == DATETIME:
+        if not isinstance(value, (str, date)):
+            raise TypeError(f"Metadata '{field}' must be a datetime or ISO string")
+        return normalize_datetime(value).isoformat()
+    return value
+
+
+def _chunk_id(parent_doc_id: str, chunk_index: int, content: str) -> str:
+    # Same derivation as prepare_document_for_indexing has always used, so IDs stay stable
+    return hashlib.md5(f"{parent_doc_id}_{chunk_index}_{content[:50]}".encode()).hexdigest()
+
+
+class DocumentBuilder:
+    """Builds index documents for the chunks of parent documents
+
+    Parent-level fields are validated and serialized once per parent and
+    copied into each chunk; the processed timestamp is taken once per batch.
+    """
+
+    def __init__(
+        self,
+        field_types: Dict[str, str] = None,
+        vector_dimensions: int = None,
+        processing_version: str = PROCESSING_VERSION
+    ):
+        field_types = field_types or METADATA_FIELD_TYPES
+        self.metadata_fields = [
+            (name, field_type, FIELD_DEFAULTS.get(name))
+            for name, field_type in field_types.items()
+            if name not in DERIVED_FIELDS
+        ]
+        # Collections are copied per chunk so documents never share a mutable list
+        self.collection_fields = [
+            name for name, field_type, _ in self.metadata_fields if field_type == STRING_COLLECTION
+        ]
+        self.vector_dimensions = vector_dimensions
+        self.processing_version = processing_version
+
+    @classmethod
+    def from_index(cls, index, **kwargs) -> "DocumentBuilder":
+        """Derive the metadata fields from a SearchIndex definition"""
+        field_types = {field.name: getattr(field.type, "value", field.type) for field in index.fields}
+        return cls(field_types=field_types, **kwargs)
+
+    def build_parent(
+        self,
+        parent_doc_id: str,
+        metadata: Dict[str, Any],
+        processed_date: str = None
+    ) -> Dict[str, Any]:
+        """Validate metadata and build the fields shared by every chunk of a parent"""
+        parent = {"parent_document_id": parent_doc_id}
+        for name, field_type, default in self.metadata_fields:
+            value = metadata.get(name, default)
+            parent[name] = _validate(name, field_type, value)
+
+        parent["pain_points"] = _dumps(metadata.get("extracted_pain_points", []))
+        parent["metadata_json"] = _dumps(metadata.get("additional_metadata", {}))
+        parent["processed_date"] = processed_date or datetime.now(timezone.utc).isoformat()
+        parent["processing_version"] = self.processing_version
+        return parent
+
+    def iter_documents(
+        self,
+        parent_doc_id: str,
+        metadata: Dict[str, Any],
+        chunks: Iterable[ChunkInput],
+        processed_date: str = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one document per (chunk_index, content, embedding[, extra metadata]) chunk"""
+        parent = self.build_parent(parent_doc_id, metadata, processed_date)
+        additional_metadata = metadata.get("additional_metadata", {})
+
+        for chunk in chunks:
+            chunk_index, content, embedding = chunk[:3]
+            chunk_id = _chunk_id(parent_doc_id, chunk_index, content)
+
+            document = parent.copy()
+            for name in self.collection_fields:
+                if document[name] is not None:
+                    document[name] = list(document[name])
+            document["id"] = chunk_id
+            document["chunk_id"] = chunk_id
+            document["chunk_index"] = chunk_index
+            document["content"] = content
+            document["content_vector"] = (
+                truncate_embedding(embedding, self.vector_dimensions) if self.vector_dimensions else embedding
+            )
+            if len(chunk) > 3 and chunk[3]:
+                document["metadata_json"] = _dumps({**additional_metadata, **chunk[3]})
+            yield document
+
+    def iter_batch(
+        self,
+        parents: Iterable[Tuple[str, Dict[str, Any], Iterable[ChunkInput]]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield documents for (parent_doc_id, metadata, chunks) entries sharing one timestamp"""
+        processed_date = datetime.now(timezone.utc).isoformat()
+        for parent_doc_id, metadata, chunks in parents:
+            yield from self.iter_documents(parent_doc_id, metadata, chunks, processed_date)
+
+    def build_one(
+        self,
+        content: str,
+        chunk_index: int,
+        parent_doc_id: str,
+        metadata: Dict[str, Any],
+        embedding: List[float]
+    ) -> Dict[str, Any]:
+        """Single-chunk form matching prepare_document_for_indexing"""
+        return next(self.iter_documents(parent_doc_id, metadata, [(chunk_index, content, embedding)]))
+
+
+def _baseline_prepare_document(content, chunk_index, parent_doc_id, metadata, embedding):
+    """prepare_document_for_indexing as it was before DocumentBuilder, kept as the benchmark baseline"""
+    chunk_id = hashlib.md5(f"{parent_doc_id}_{chunk_index}_{content[:50]}".encode()).hexdigest()
+    pain_points = metadata.get("extracted_pain_points", [])
+    return {
+        "id": chunk_id, "content": content, "chunk_id": chunk_id, "chunk_index": chunk_index,
+        "parent_document_id": parent_doc_id, "content_vector": embedding,
+        "customer_id": metadata.get("customer_id"), "customer_name": metadata.get("customer_name"),
+        "customer_tier": metadata.get("customer_tier"), "customer_region": metadata.get("customer_region"),
+        "communication_type": metadata.get("communication_type"),
+        "communication_date": metadata.get("communication_date"),
+        "subject": metadata.get("subject", ""), "priority": metadata.get("priority", "medium"),
+        "product_id": metadata.get("product_id"), "product_name": metadata.get("product_name"),
+        "product_category": metadata.get("product_category"),
+        "issue_type": metadata.get("issue_type"), "issue_category": metadata.get("issue_category"),
+        "sentiment_score": metadata.get("sentiment_score", 0.0),
+        "sentiment_label": metadata.get("sentiment_label", "neutral"),
+        "urgency_score": metadata.get("urgency_score", 0.0),
+        "pain_points": json.dumps(pain_points), "tags": metadata.get("tags", []),
+        "processed_date": datetime.utcnow().isoformat(), "processing_version": "1.0",
+        "metadata_json": json.dumps(metadata.get("additional_metadata", {}))
+    }
+
+
+def benchmark_builder(parent_count: int = 2000, chunks_per_parent: int = 20, dimensions: int = 1536):
+    """Compare per-chunk cost of the baseline function and DocumentBuilder"""
+    metadata = {
+        "customer_id": "CUST-12345", "customer_name": "Acme Corporation", "customer_tier": "enterprise",
+        "customer_region": "north_america", "communication_type": "email",
+        "communication_date": datetime(2025, 8, 4, 10, 30, 0), "subject": "Billing discrepancies",
+        "priority": "high", "product_id": "PROD-BILLING-001", "product_name": "Enterprise Billing System",
+        "product_category": "billing", "issue_type": "billing", "issue_category": "incorrect_charges",
+        "sentiment_score": -0.7, "sentiment_label": "negative", "urgency_score": 0.85,
+        "extracted_pain_points": [{"description": "Incorrect monthly charges", "severity": "high"}] * 3,
+        "tags": ["billing_error", "access_issue"],
+        "additional_metadata": {"ticket_id": "TKT-98765", "assigned_team": "billing_support"}
+    }
+    embedding = [0.01] * dimensions
+    content = "We have been experiencing significant billing discrepancies for the past three months. " * 4
+    total = parent_count * chunks_per_parent
+
+    start = time.perf_counter()
+    for parent in range(parent_count):
+        for chunk_index in range(chunks_per_parent):
+            _baseline_prepare_document(content, chunk_index, f"DOC-{parent}", metadata, embedding)
+    baseline = time.perf_counter() - start
+
+    builder = DocumentBuilder()
+    start = time.perf_counter()
+    for _ in builder.iter_batch(
+        (f"DOC-{parent}", metadata, ((i, content, embedding) for i in range(chunks_per_parent)))
+        for parent in range(parent_count)
+    ):
+        pass
+    built = time.perf_counter() - start
+
+    print(f"Built {total:,} chunk documents ({chunks_per_parent} chunks per parent)")
+    print(f"  • Baseline function: {baseline / total * 1e6:.2f} µs/chunk")
+    print(f"  • DocumentBuilder:   {built / total * 1e6:.2f} µs/chunk ({baseline / built:.1f}x)")
+    return {"baseline_us": baseline / total * 1e6, "builder_us": built / total * 1e6}
+
+
+if __name__ == "__main__":
+    benchmark_builder()
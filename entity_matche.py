@@ -1,3 +1,20 @@
+import re
+
+# Dropped before exact matching so "Acme Corp." and "ACME Corporation" normalize alike
+LEGAL_SUFFIXES = {
+    "the", "inc", "incorporated", "corp", "corporation", "co", "company", "llc", "llp", "ltd",
+    "limited", "plc", "gmbh", "ag", "sa", "bv", "pty"
+}
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_name(name):
+    """Lowercase, strip punctuation and legal suffixes ("Acme Corp." -> "acme")"""
+    words = _PUNCTUATION.sub(" ", name.lower()).split()
+    core = [word for word in words if word not in LEGAL_SUFFIXES]
+    return " ".join(core or words)
+
+
 # OPTIMIZED SOLUTION with better time complexity:
 class OptimizedNameMatcher:
     def __init__(self, global_name_dict=None):
@@ -5,6 +22,7 @@ class OptimizedNameMatcher:
         self.next_id = max(self.global_name_dict.values()) + 1 if self.global_name_dict else 1
         
         # Build inverted index for O(1) lookups
+        self.name_to_id = {}  # Normalized name without spaces -> ID, for find_exact_id
         self.word_to_id = {}
         self.prefix_to_id = {}
         self._build_indexes()
@@ -12,20 +30,38 @@ class OptimizedNameMatcher:
     def _build_indexes(self):
         """Build lookup indexes - O(N * L) preprocessing"""
         for name, id_val in self.global_name_dict.items():
-            name_lower = name.lower()
-            
-            # Index by words
-            for word in name_lower.split():
-                if word not in self.word_to_id:
-                    self.word_to_id[word] = []
-                self.word_to_id[word].append(id_val)
-            
-            # Index by prefixes (for substring matching)
-            for i in range(len(name_lower)):
-                prefix = name_lower[:i+1]
-                if prefix not in self.prefix_to_id:
-                    self.prefix_to_id[prefix] = []
-                self.prefix_to_id[prefix].append(id_val)
+            self._index_name(name, id_val)
+    
+    def _index_name(self, name, id_val):
+        """Add one name to the indexes - O(L)"""
+        name_lower = name.lower()
+        self.name_to_id.setdefault(normalize_name(name).replace(" ", ""), id_val)
+        
+        # Index by words
+        for word in name_lower.split():
+            if word not in self.word_to_id:
+                self.word_to_id[word] = []
+            self.word_to_id[word].append(id_val)
+        
+        # Index by prefixes (for substring matching)
+        for i in range(len(name_lower)):
+            prefix = name_lower[:i+1]
+            if prefix not in self.prefix_to_id:
+                self.prefix_to_id[prefix] = []
+            self.prefix_to_id[prefix].append(id_val)
+    
+    def add_name(self, name, id_val=None):
+        """Register one name incrementally, without rebuilding - O(L); returns its ID"""
+        if id_val is None:
+            id_val = self.next_id
+        self.next_id = max(self.next_id, id_val + 1)
+        self.global_name_dict[name] = id_val
+        self._index_name(name, id_val)
+        return id_val
+    
+    def find_exact_id(self, new_name):
+        """ID of a known name that normalizes exactly like new_name, else None - O(L)"""
+        return self.name_to_id.get(normalize_name(new_name).replace(" ", ""))
     
     def find_matching_id_optimized(self, new_name):
         """Find matching ID using indexes - O(L) average case"""
@@ -0,0 +1,152 @@
+# HNSW Parameter Tuning
+# Per-index HNSW settings and an offline recall/QPS/memory sweep over sample embeddings
+
+import csv
+import itertools
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Values the index used before they became configurable
+DEFAULT_HNSW_PARAMETERS = {
+    "m": 4,  # Number of bi-directional links
+    "ef_construction": 400,  # Size of dynamic list
+    "ef_search": 500,  # Size of dynamic list for search
+    "metric": "cosine"
+}
+
+# Ranges accepted by Azure AI Search for HNSW parameters
+HNSW_PARAMETER_RANGES = {
+    "m": (4, 10),
+    "ef_construction": (100, 1000),
+    "ef_search": (100, 1000)
+}
+HNSW_METRICS = ("cosine", "euclidean", "dotProduct")
+
+
+def resolve_hnsw_parameters(overrides: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Merge overrides onto the defaults and check them against the service limits"""
+    parameters = dict(DEFAULT_HNSW_PARAMETERS)
+    for name, value in (overrides or {}).items():
+        if name not in parameters:
+            raise ValueError(f"Unknown HNSW parameter '{name}'")
+        parameters[name] = value
+
+    for name, (low, high) in HNSW_PARAMETER_RANGES.items():
+        if not low <= parameters[name] <= high:
+            raise ValueError(f"HNSW parameter '{name}' must be between {low} and {high}")
+    if parameters["metric"] not in HNSW_METRICS:
+        raise ValueError(f"HNSW metric must be one of {HNSW_METRICS}")
+    return parameters
+
+
+def load_embeddings(path: str, dimensions: int = None):
+    """Load a sample of embeddings from .npy, or from JSONL documents with content_vector"""
+    import numpy as np
+
+    if path.endswith(".npy"):
+        vectors = np.load(path)
+    else:
+        with open(path, encoding="utf-8") as f:
+            vectors = np.array([json.loads(line)["content_vector"] for line in f if line.strip()], dtype=np.float32)
+
+    vectors = vectors.astype(np.float32)
+    if dimensions:
+        vectors = vectors[:, :dimensions]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _index_size_bytes(vector_index) -> int:
+    """Serialized size of an hnswlib graph (vectors plus links)"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.bin")
+        vector_index.index.save_index(path)
+        return os.path.getsize(path)
+
+
+def sweep_hnsw_parameters(
+    vectors,
+    query_count: int = 500,
+    k: int = 10,
+    m_values: List[int] = (4, 6, 8, 10),
+    ef_construction_values: List[int] = (100, 400, 800),
+    ef_search_values: List[int] = (100, 200, 500, 1000),
+    output_path: str = None
+) -> List[Dict[str, Any]]:
+    """Build local HNSW graphs over the sample and report recall@k, QPS and memory
+
+    The last `query_count` vectors are held out as queries; ground truth is
+    brute-force cosine search over the rest. Results can be written to a
+    .csv or .json output_path for comparison between runs.
+    """
+    import numpy as np
+
+    from local_search_engine import HnswVectorIndex, NumpyVectorIndex
+
+    corpus, queries = vectors[:-query_count], vectors[-query_count:]
+    brute_force = NumpyVectorIndex(corpus.shape[1])
+    brute_force.add(corpus)
+    exact = [set(brute_force.search(query, k)[0].tolist()) for query in queries]
+
+    print(f"Sweeping HNSW over {len(corpus):,} vectors ({corpus.shape[1]} dims), {query_count} queries, k={k}")
+    print(f"{'m':>3} {'efC':>5} {'efS':>5} {'recall':>7} {'QPS':>9} {'build s':>8} {'MB':>8}")
+
+    rows = []
+    for m, ef_construction in itertools.product(m_values, ef_construction_values):
+        start = time.perf_counter()
+        vector_index = HnswVectorIndex(corpus.shape[1], m=m, ef_construction=ef_construction, max_elements=len(corpus))
+        vector_index.add(corpus)
+        build_seconds = time.perf_counter() - start
+        size_mb = _index_size_bytes(vector_index) / (1024 * 1024)
+
+        for ef_search in ef_search_values:
+            vector_index.set_ef_search(max(ef_search, k))
+            start = time.perf_counter()
+            labels = vector_index.search_batch(queries, k)
+            elapsed = time.perf_counter() - start
+
+            recall = float(np.mean([len(set(row) & truth) / k for row, truth in zip(labels.tolist(), exact)]))
+            row = {
+                "m": m,
+                "ef_construction": ef_construction,
+                "ef_search": ef_search,
+                "recall": recall,
+                "qps": query_count / elapsed if elapsed else 0.0,
+                "build_seconds": build_seconds,
+                "index_mb": size_mb
+            }
+            rows.append(row)
+            print(f"{m:>3} {ef_construction:>5} {ef_search:>5} {recall:>7.3f} {row['qps']:>9,.0f} {build_seconds:>8.2f} {size_mb:>8.1f}")
+
+    if output_path:
+        if output_path.endswith(".csv"):
+            with open(output_path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(output_path, "w") as f:
+                json.dump(rows, f, indent=2)
+        print(f"Results written to {output_path}")
+
+    return rows
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        sample = load_embeddings(sys.argv[1])
+    else:
+        import numpy as np
+
+        print("No embedding sample given (.npy or .jsonl); using synthetic clustered vectors")
+        rng = np.random.default_rng(5)
+        centers = rng.normal(size=(50, 256)).astype(np.float32)
+        sample = centers[rng.integers(0, 50, 20000)] + 0.5 * rng.normal(size=(20000, 256)).astype(np.float32)
+        sample /= np.linalg.norm(sample, axis=1, keepdims=True)
+
+    sweep_hnsw_parameters(sample, output_path=sys.argv[2] if len(sys.argv) > 2 else None)
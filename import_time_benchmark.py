@@ -0,0 +1,86 @@
+# Import-Time Benchmark
+# Fresh-interpreter import cost of the entry-point modules, failing if heavy dependencies load eagerly
+
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple
+
+# Module -> packages it must only load on the code paths that need them
+DEFERRED_IMPORTS = {
+    "tmx_comparision": ["pandas", "numpy", "chardet", "pyarrow"],
+    "azure_ai_search_schema": ["azure", "numpy", "pandas"],
+    "index_partitioning": ["azure", "numpy"],
+    "document_builder": ["azure", "numpy"],
+    "search_filters": ["azure", "numpy"],
+    "pain_point_extraction": ["azure", "numpy", "tiktoken"],
+    "customer_resolution": ["azure", "numpy"],
+    "vector_compression": ["numpy"],
+}
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ImportTiming(NamedTuple):
+    """Best-of-N cumulative import time of one module and the deferred packages it loaded"""
+    module: str
+    milliseconds: float
+    eager_imports: List[str]
+
+
+def _import_profile(module: str) -> Dict[str, int]:
+    """Cumulative microseconds per imported module, from python -X importtime in a new interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def measure_import(module: str, deferred: List[str] = (), repeats: int = 5) -> ImportTiming:
+    best = float("inf")
+    loaded = set()
+    for _ in range(repeats):
+        profile = _import_profile(module)
+        best = min(best, profile.get(module, 0) / 1000)
+        loaded |= set(profile)
+    eager = sorted({package for package in deferred
+                    for name in loaded if name == package or name.startswith(package + ".")})
+    return ImportTiming(module, best, eager)
+
+
+def run_benchmark(modules: Dict[str, List[str]] = None, max_ms: float = None, repeats: int = 5) -> List[ImportTiming]:
+    """Print import times and return them; callers treat eager_imports (or > max_ms) as a regression"""
+    modules = modules or DEFERRED_IMPORTS
+    print(f"{'module':>24} {'import ms':>10}  eager heavy imports")
+    timings = []
+    for module, deferred in modules.items():
+        timing = measure_import(module, deferred, repeats)
+        timings.append(timing)
+        over = " (over budget)" if max_ms is not None and timing.milliseconds > max_ms else ""
+        print(f"{module:>24} {timing.milliseconds:>10.1f}{over}  {', '.join(timing.eager_imports) or '-'}")
+    return timings
+
+
+if __name__ == "__main__":
+    # python import_time_benchmark.py [max_ms] [results.json]
+    max_ms = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    timings = run_benchmark(max_ms=max_ms)
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as f:
+            json.dump([timing._asdict() for timing in timings], f, indent=2)
+
+    failed = [t.module for t in timings if t.eager_imports or (max_ms is not None and t.milliseconds > max_ms)]
+    if failed:
+        print(f"Import-time regression in: {', '.join(failed)}")
+        sys.exit(1)
@@ -0,0 +1,89 @@
+# Lazy Search Hits
+# Projected search results that hydrate missing fields in one batched lookup on first access
+
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, List
+
+from search_fields import FIELD_PROFILES, JSON_FIELDS, RETRIEVABLE_FIELDS
+from search_filters import compile_filter
+
+
+def resolve_select(profile) -> List[str]:
+    """Field list for a profile name, or the list itself"""
+    if isinstance(profile, str):
+        if profile not in FIELD_PROFILES:
+            raise ValueError(f"Unknown field profile '{profile}', expected one of {sorted(FIELD_PROFILES)}")
+        return list(FIELD_PROFILES[profile])
+    return list(profile)
+
+
+class HitHydrator:
+    """Loads the fields a result set was not projected with, for all of its hits at once"""
+
+    def __init__(self, search_client, selected: List[str]):
+        self.search_client = search_client
+        self.missing = [field for field in RETRIEVABLE_FIELDS if field not in selected]
+        self.hits: List["LazySearchHit"] = []
+        self.hydrated = not self.missing
+
+    def hydrate(self):
+        if self.hydrated:
+            return
+        ids = [hit.raw["id"] for hit in self.hits]
+        results = self.search_client.search(
+            search_text="*",
+            filter=compile_filter({"id": ids}),
+            select=["id"] + self.missing,
+            top=len(ids)
+        )
+        by_id = {doc["id"]: doc for doc in results}
+        for hit in self.hits:
+            fetched = by_id.get(hit.raw["id"], {})
+            for field in self.missing:
+                hit.raw.setdefault(field, fetched.get(field))
+        self.hydrated = True
+
+
+class LazySearchHit(Mapping):
+    """Read-only view of a search hit
+
+    Fields outside the projection are fetched for the whole result set on
+    first access, and JSON string fields are decoded only when read.
+    """
+
+    def __init__(self, raw: Dict[str, Any], hydrator: HitHydrator):
+        self.raw = raw
+        self._hydrator = hydrator
+        self._decoded: Dict[str, Any] = {}
+        hydrator.hits.append(self)
+
+    def __getitem__(self, field: str):
+        if field not in self.raw and field in self._hydrator.missing:
+            self._hydrator.hydrate()
+        value = self.raw[field]
+
+        if field in JSON_FIELDS and isinstance(value, str):
+            if field not in self._decoded:
+                self._decoded[field] = json.loads(value)
+            return self._decoded[field]
+        return value
+
+    def __contains__(self, field) -> bool:
+        return field in self.raw or field in self._hydrator.missing
+
+    def __iter__(self):
+        yield from self.raw
+        yield from (field for field in self._hydrator.missing if field not in self.raw)
+
+    def __len__(self) -> int:
+        return len(set(self.raw) | set(self._hydrator.missing))
+
+    def __repr__(self):
+        return f"LazySearchHit({self.raw!r})"
+
+
+def wrap_hits(documents: List[Dict[str, Any]], search_client, selected: List[str]) -> List[LazySearchHit]:
+    """Wrap one result set so its hits share a single hydration round trip"""
+    hydrator = HitHydrator(search_client, selected)
+    return [LazySearchHit(dict(doc), hydrator) for doc in documents]
@@ -0,0 +1,380 @@
+# Local Pain Point Search Engine
+# In-process vector + BM25 hybrid retrieval with the same interface as PainPointRAGSearcher
+
+import heapq
+import json
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from lazy_hits import HitHydrator, LazySearchHit, resolve_select
+from search_fields import JSON_FIELDS, PAIN_POINT_SEARCH_FIELDS, PAIN_POINT_SEARCH_TEXT_FIELDS
+from search_filters import matches_clauses, parse_filters
+
+RRF_K = 60  # Reciprocal rank fusion constant, as used by Azure AI Search
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _json_values(value) -> List[str]:
+    """Leaf values of decoded JSON, so keys like "description" are not indexed as terms"""
+    if isinstance(value, dict):
+        return [text for item in value.values() for text in _json_values(item)]
+    if isinstance(value, list):
+        return [text for item in value for text in _json_values(item)]
+    return [] if value is None else [str(value)]
+
+
+def _field_text(doc: Dict[str, Any], field: str) -> str:
+    value = doc.get(field)
+    if value is None:
+        return ""
+    if field in JSON_FIELDS and isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value
+        return " ".join(_json_values(value))
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+class NumpyVectorIndex:
+    """Exact cosine-similarity index over a dense matrix"""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._pending: List[np.ndarray] = []
+        self._matrix = np.empty((0, dimensions), dtype=np.float32)
+
+    def __len__(self):
+        return len(self._matrix) + sum(len(block) for block in self._pending)
+
+    def add(self, vectors) -> None:
+        block = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        self._pending.append(block / np.where(norms == 0, 1, norms))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._pending:
+            self._matrix = np.vstack([self._matrix, *self._pending])
+            self._pending = []
+        return self._matrix
+
+    def search(self, query, k: int, mask: np.ndarray = None):
+        """Return (row indices, cosine scores) of the k nearest rows allowed by mask"""
+        matrix = self.matrix
+        if not len(matrix) or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = top[np.isfinite(scores[top])]
+        return top, scores[top]
+
+
+class HnswVectorIndex:
+    """Approximate cosine index backed by hnswlib"""
+
+    def __init__(self, dimensions: int, m: int = 16, ef_construction: int = 200, ef_search: int = 100, max_elements: int = 10000):
+        import hnswlib
+
+        self.dimensions = dimensions
+        self.index = hnswlib.Index(space="cosine", dim=dimensions)
+        self.index.init_index(max_elements=max_elements, M=m, ef_construction=ef_construction)
+        self.index.set_ef(ef_search)
+
+    def __len__(self):
+        return self.index.get_current_count()
+
+    def add(self, vectors) -> None:
+        block = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+        start = self.index.get_current_count()
+        needed = start + len(block)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(block, np.arange(start, needed))
+
+    def set_ef_search(self, ef_search: int) -> None:
+        self.index.set_ef(ef_search)
+
+    def search_batch(self, queries, k: int, num_threads: int = 1) -> np.ndarray:
+        """Unfiltered k-NN labels for a matrix of queries"""
+        labels, _ = self.index.knn_query(np.asarray(queries, dtype=np.float32), k=k, num_threads=num_threads)
+        return labels.astype(np.int64)
+
+    def search(self, query, k: int, mask: np.ndarray = None):
+        k = min(k, len(self))
+        if mask is not None:
+            k = min(k, int(mask[:len(self)].sum()))  # hnswlib raises when fewer than k rows pass
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        allowed = (lambda label: bool(mask[label])) if mask is not None else None
+        try:
+            labels, distances = self.index.knn_query(np.asarray(query, dtype=np.float32), k=k, filter=allowed)
+        except RuntimeError:
+            # The graph walk reached fewer than k allowed rows; scan them exactly instead
+            return self._scan(query, k, np.flatnonzero(mask[:len(self)]))
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+    def _scan(self, query, k: int, rows: np.ndarray):
+        """Exact cosine top-k over the given rows"""
+        vectors = np.asarray(self.index.get_items(rows), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        query = np.asarray(query, dtype=np.float32)
+        scores = vectors @ query / (np.where(norms == 0, 1, norms) * (np.linalg.norm(query) or 1.0))
+        order = np.argsort(-scores)[:k]
+        return rows[order].astype(np.int64), scores[order]
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.doc_lengths: List[int] = []
+        self.total_length = 0
+        self.removed = 0  # Replaced documents, excluded from the corpus statistics
+
+    def add(self, text: str) -> int:
+        doc_idx = len(self.doc_lengths)
+        terms = tokenize(text)
+        for term, count in Counter(terms).items():
+            self.postings[term][doc_idx] = count
+        self.doc_lengths.append(len(terms))
+        self.total_length += len(terms)
+        return doc_idx
+
+    def remove(self, doc_idx: int, text: str) -> None:
+        """Drop a document indexed from text, so doc count and average length stay exact"""
+        for term in set(tokenize(text)):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_idx, None)
+        self.total_length -= self.doc_lengths[doc_idx]
+        self.doc_lengths[doc_idx] = 0
+        self.removed += 1
+
+    def search(self, query_terms: List[str], k: int, mask: np.ndarray = None):
+        """Return [(doc index, score)] for the k best matches allowed by mask"""
+        doc_count = len(self.doc_lengths) - self.removed
+        if not doc_count:
+            return []
+        avg_length = self.total_length / doc_count
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(query_terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_idx, tf in postings.items():
+                if mask is not None and not mask[doc_idx]:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_idx] / avg_length)
+                scores[doc_idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+class _LocalHitHydrator(HitHydrator):
+    """Hydrates lazy hits from the searcher's in-memory documents instead of a search call"""
+
+    def __init__(self, searcher: "LocalPainPointSearcher", selected: List[str]):
+        super().__init__(None, selected)
+        self.searcher = searcher
+
+    def hydrate(self):
+        if self.hydrated:
+            return
+        for hit in self.hits:
+            row = self.searcher.id_to_row.get(hit.raw["id"])
+            doc = self.searcher.documents[row] if row is not None else {}
+            for field in self.missing:
+                hit.raw.setdefault(field, doc.get(field))
+        self.hydrated = True
+
+
+def _search_text(doc: Dict[str, Any]) -> str:
+    return " ".join(_field_text(doc, field) for field in PAIN_POINT_SEARCH_TEXT_FIELDS)
+
+
+class LocalPainPointSearcher:
+    """Drop-in replacement for PainPointRAGSearcher without an Azure dependency
+
+    Documents are the dicts produced by prepare_document_for_indexing and
+    filters are evaluated with the same compiler as the Azure path.
+    hybrid_search fuses BM25 and vector rankings with reciprocal rank fusion.
+    """
+
+    def __init__(self, dimensions: int = 1536, vector_index=None):
+        # An empty index is falsy (len 0), so test for None rather than truthiness
+        self.vector_index = vector_index if vector_index is not None else NumpyVectorIndex(dimensions)
+        self.text_index = BM25Index()
+        self.documents: List[Dict[str, Any]] = []
+        self.id_to_row: Dict[str, int] = {}
+        self._alive: List[bool] = []
+
+    def index_documents(self, documents: List[Dict[str, Any]]):
+        """Add or replace documents (upload semantics, keyed on id)"""
+        vectors = []
+        for doc in documents:
+            previous = self.id_to_row.get(doc["id"])
+            if previous is not None:
+                self._alive[previous] = False
+                self.text_index.remove(previous, _search_text(self.documents[previous]))
+
+            row = self.text_index.add(_search_text(doc))
+            self.documents.append(doc)
+            self._alive.append(True)
+            self.id_to_row[doc["id"]] = row
+            vectors.append(doc["content_vector"])
+
+        if vectors:
+            self.vector_index.add(vectors)
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        mask = np.array(self._alive, dtype=bool)
+        clauses = parse_filters(filters)
+        if clauses:
+            for row, doc in enumerate(self.documents):
+                if mask[row] and not matches_clauses(doc, clauses):
+                    mask[row] = False
+        return mask
+
+    def _project(self, row: int, score: float, fields: List[str]) -> Dict[str, Any]:
+        doc = self.documents[row]
+        result = {field: doc.get(field) for field in fields}
+        result["@search.score"] = score
+        return result
+
+    def hybrid_search(
+        self,
+        query: str,
+        query_vector: List[float],
+        filters: Dict[str, Any] = None,
+        top_k: int = 20,
+        profile="summary",
+        lazy: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Perform hybrid search with metadata filtering
+
+        profile and lazy behave as in PainPointRAGSearcher.hybrid_search;
+        lazy hits hydrate from the in-memory documents.
+        """
+        select = resolve_select(profile)
+        mask = self._filter_mask(filters)
+        window = max(top_k, 50)  # Candidates taken from each ranking before fusion
+
+        fused: Dict[int, float] = defaultdict(float)
+        for rank, (row, _) in enumerate(self.text_index.search(tokenize(query), window, mask)):
+            fused[row] += 1.0 / (RRF_K + rank + 1)
+        rows, _ = self.vector_index.search(query_vector, window, mask)
+        for rank, row in enumerate(rows):
+            fused[int(row)] += 1.0 / (RRF_K + rank + 1)
+
+        best = heapq.nlargest(top_k, fused.items(), key=lambda item: item[1])
+        documents = [self._project(row, score, select) for row, score in best]
+        if not lazy:
+            return documents
+        hydrator = _LocalHitHydrator(self, select)
+        return [LazySearchHit(doc, hydrator) for doc in documents]
+
+    def search_by_pain_point_pattern(
+        self,
+        pain_point_keywords: List[str],
+        filters: Dict[str, Any] = None,
+        top: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Search for specific pain point patterns"""
+        query_terms = [term for keyword in pain_point_keywords for term in tokenize(keyword)]
+        hits = self.text_index.search(query_terms, top, self._filter_mask(filters))
+        return [self._project(row, score, PAIN_POINT_SEARCH_FIELDS) for row, score in hits]
+
+
+def _synthetic_corpus(doc_count: int, dimensions: int, seed: int = 7):
+    """Clustered embeddings with matching keyword content"""
+    rng = np.random.default_rng(seed)
+    topics = ["billing", "access", "outage", "calibration", "shipping", "license", "latency", "invoice"]
+    centers = rng.normal(size=(len(topics), dimensions)).astype(np.float32)
+    tiers = ["enterprise", "standard", "basic"]
+
+    documents = []
+    for i in range(doc_count):
+        topic = i % len(topics)
+        vector = centers[topic] + 0.6 * rng.normal(size=dimensions).astype(np.float32)
+        documents.append({
+            "id": f"doc-{i}",
+            "content": f"customer reports {topics[topic]} problem number {i}",
+            "content_vector": vector,
+            "customer_id": f"CUST-{i % 500:05d}",
+            "customer_tier": tiers[i % len(tiers)],
+            "pain_points": json.dumps([{"description": f"{topics[topic]} issue"}]),
+            "tags": [topics[topic]],
+            "communication_date": datetime(2025, 1 + i % 12, 1, tzinfo=timezone.utc).isoformat()
+        })
+    return documents, centers, topics
+
+
+def benchmark_local_engine(doc_count: int = 20000, dimensions: int = 256, query_count: int = 200, k: int = 10):
+    """Report vector recall@k and latency versus brute force, plus hybrid search latency"""
+    documents, centers, topics = _synthetic_corpus(doc_count, dimensions)
+    rng = np.random.default_rng(11)
+    queries = [
+        (topics[q % len(topics)], centers[q % len(topics)] + 0.6 * rng.normal(size=dimensions).astype(np.float32))
+        for q in range(query_count)
+    ]
+
+    brute_force = NumpyVectorIndex(dimensions)
+    brute_force.add([doc["content_vector"] for doc in documents])
+
+    start = time.perf_counter()
+    exact = [set(brute_force.search(vector, k)[0].tolist()) for _, vector in queries]
+    brute_ms = (time.perf_counter() - start) * 1000 / query_count
+    print(f"Brute force: {brute_ms:.2f} ms/query over {doc_count:,} docs ({dimensions} dims)")
+
+    try:
+        approximate = HnswVectorIndex(dimensions, max_elements=doc_count)
+    except ImportError:
+        approximate = None
+        print("hnswlib not installed; skipping HNSW recall comparison")
+
+    if approximate is not None:
+        approximate.add([doc["content_vector"] for doc in documents])
+        start = time.perf_counter()
+        found = [set(approximate.search(vector, k)[0].tolist()) for _, vector in queries]
+        hnsw_ms = (time.perf_counter() - start) * 1000 / query_count
+        recall = sum(len(a & b) for a, b in zip(found, exact)) / (k * query_count)
+        print(f"HNSW: {hnsw_ms:.2f} ms/query, recall@{k} = {recall:.3f}")
+
+    searcher = LocalPainPointSearcher(dimensions=dimensions)
+    searcher.index_documents(documents)
+    filters = {"customer_tier": ["enterprise", "standard"]}
+    start = time.perf_counter()
+    for topic, vector in queries:
+        searcher.hybrid_search(f"{topic} problem", vector, filters=filters, top_k=k)
+    hybrid_ms = (time.perf_counter() - start) * 1000 / query_count
+    print(f"Hybrid search (filtered): {hybrid_ms:.2f} ms/query")
+
+
+if __name__ == "__main__":
+    benchmark_local_engine()
@@ -0,0 +1,372 @@
+# Name Matching Benchmark
+# Synthetic company-name corpora and build / lookup / memory / accuracy measurements for entity_matche.py
+
+import bisect
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from entity_matche import OptimizedNameMatcher, normalize_name
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+RESULTS_PATH = "name_matching_benchmark.jsonl"  # One JSON line per run, for comparing versions
+NAIVE_MAX_NAMES = 1_000_000  # Larger corpora skip the O(N)-per-lookup baseline
+NAIVE_SAMPLE = 200  # Queries checked against the baseline
+
+SYLLABLES = (
+    "ac ad al am an ar as at ba be bo ca ce co da de di do el en er ex fa fi fo ga ge go "
+    "ha he in is ka ki ko la le li lo lu ma me mi mo na ne no ol om on or pa pe po ra re "
+    "ri ro sa se si so ta te ti to tr ul um un ur va ve vi vo xa ya ze zo"
+).split()
+# Ranked by how often they appear in real company names; the generic ones head the Zipf distribution
+COMMON_WORDS = [
+    "Global", "Group", "Solutions", "Services", "Systems", "International", "Technologies",
+    "Holdings", "Partners", "Industries", "Consulting", "Software", "Labs", "Enterprises",
+    "Capital", "Health", "Energy", "Digital", "Logistics", "Foods", "Media", "Networks",
+    "Analytics", "Pharma", "Motors", "Bank", "Security", "Retail", "Cloud", "Data"
+]
+SUFFIXES = [
+    ("", 0.30), ("Inc", 0.16), ("Inc.", 0.08), ("LLC", 0.12), ("Ltd", 0.08), ("Ltd.", 0.04),
+    ("Corp", 0.06), ("Corp.", 0.04), ("Corporation", 0.05), ("Co.", 0.02), ("GmbH", 0.02),
+    ("PLC", 0.02), ("Limited", 0.01)
+]
+
+
+class Query(NamedTuple):
+    """A name to resolve and the entity it was generated from (None for a new company)"""
+    name: str
+    entity: Optional[int]
+
+
+class NameCorpus(NamedTuple):
+    """Known {name: entity ID} dictionary plus labelled lookup queries"""
+    known: Dict[str, int]
+    queries: List[Query]
+
+
+class NameGenerator:
+    """Company names with Zipf-distributed tokens, legal suffixes, case/punctuation variants and typos
+
+    Token rank r is drawn with probability proportional to 1 / r**zipf_s,
+    so a few words ("Global", "Systems", popular invented brands) are shared
+    by many companies while the long tail keeps most names distinctive.
+    """
+
+    def __init__(self, seed: int = 7, vocabulary_size: int = 50_000, zipf_s: float = 1.07, typo_rate: float = 0.1):
+        self.rng = random.Random(seed)
+        self.typo_rate = typo_rate
+        brands = set()
+        while len(brands) < vocabulary_size - len(COMMON_WORDS):
+            brands.add("".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4))).capitalize())
+        # Interleave so common words sit near the head of the ranking, brands fill the tail
+        brands = sorted(brands)
+        self.rng.shuffle(brands)
+        self.tokens = COMMON_WORDS[:10] + brands[:40] + COMMON_WORDS[10:] + brands[40:]
+        weights = [1.0 / (rank ** zipf_s) for rank in range(1, len(self.tokens) + 1)]
+        self.cum_weights = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            self.cum_weights.append(total)
+        self.suffixes = [suffix for suffix, _ in SUFFIXES]
+        self.suffix_cum_weights = []
+        total = 0.0
+        for _, weight in SUFFIXES:
+            total += weight
+            self.suffix_cum_weights.append(total)
+
+    def _token(self) -> str:
+        position = bisect.bisect(self.cum_weights, self.rng.random() * self.cum_weights[-1])
+        return self.tokens[min(position, len(self.tokens) - 1)]
+
+    def _suffix(self) -> str:
+        return self.rng.choices(self.suffixes, cum_weights=self.suffix_cum_weights)[0]
+
+    def company_name(self) -> str:
+        words = [self._token() for _ in range(self.rng.choices((1, 2, 3), weights=(0.35, 0.5, 0.15))[0])]
+        suffix = self._suffix()
+        return " ".join(words + [suffix]) if suffix else " ".join(words)
+
+    def typo(self, word: str) -> str:
+        """One swap, deletion, substitution or insertion"""
+        if len(word) < 4:
+            return word
+        i = self.rng.randrange(1, len(word) - 1)
+        kind = self.rng.randrange(4)
+        letter = self.rng.choice("abcdefghijklmnopqrstuvwxyz")
+        if kind == 0:
+            return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+        if kind == 1:
+            return word[:i] + word[i + 1:]
+        if kind == 2:
+            return word[:i] + letter + word[i + 1:]
+        return word[:i] + letter + word[i:]
+
+    def variant(self, name: str) -> str:
+        """How the same company shows up in another system"""
+        words = normalize_name(name).split()
+        if self.rng.random() < self.typo_rate:
+            i = self.rng.randrange(len(words))
+            words[i] = self.typo(words[i])
+        style = self.rng.randrange(4)
+        if style == 0:
+            words = [word.upper() for word in words]
+        elif style == 1:
+            words = [word.capitalize() for word in words]
+        text = ("-" if self.rng.random() < 0.05 else " ").join(words)
+        suffix = self._suffix()
+        if suffix:
+            text += ("," if self.rng.random() < 0.2 else "") + " " + suffix
+        return "The " + text if self.rng.random() < 0.03 else text
+
+    def corpus(self, size: int, query_count: int = 10_000, new_fraction: float = 0.2) -> NameCorpus:
+        """size known companies and query_count lookups (variants of known ones, or new companies)"""
+        known: Dict[str, int] = {}
+        seen = set()
+        while len(known) < size:
+            name = self.company_name()
+            key = normalize_name(name).replace(" ", "")
+            if key not in seen:
+                seen.add(key)
+                known[name] = len(known) + 1
+        names = list(known)
+
+        queries = []
+        while len(queries) < query_count:
+            if self.rng.random() < new_fraction:
+                name = self.company_name()
+                if normalize_name(name).replace(" ", "") not in seen:
+                    queries.append(Query(name, None))
+            else:
+                name = names[self.rng.randrange(size)]
+                queries.append(Query(self.variant(name), known[name]))
+        return NameCorpus(known, queries)
+
+
+class NaiveNameMatcher:
+    """The O(M * N * L) scan: OptimizedNameMatcher's rules checked against every known name"""
+
+    def __init__(self, global_name_dict: Dict[str, int]):
+        self.entries = [(name.lower(), set(name.lower().split()), id_val) for name, id_val in global_name_dict.items()]
+
+    def find_matching_id(self, new_name: str) -> Optional[int]:
+        new_name_lower = new_name.lower()
+
+        # First known name sharing a word, in dictionary order, like word_to_id[word][0]
+        for word in new_name_lower.split():
+            for _, words, id_val in self.entries:
+                if word in words:
+                    return id_val
+        # Then the first known name starting with the shortest prefix that any name starts with
+        for i in range(len(new_name_lower)):
+            prefix = new_name_lower[:i + 1]
+            for known, _, id_val in self.entries:
+                if known.startswith(prefix):
+                    return id_val
+        return None
+
+
+def percentiles(values: List[float], points=(50, 90, 99, 99.9)) -> Dict[str, float]:
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        rank = max(0, min(len(ordered) - 1, int(round(point / 100.0 * len(ordered) + 0.5)) - 1))
+        result[f"p{point:g}"] = ordered[rank]
+    result["max"] = ordered[-1]
+    return result
+
+
+def index_memory(matcher: OptimizedNameMatcher) -> Dict[str, int]:
+    """Bytes held by each index: dict tables, keys and ID lists (IDs are shared with the name dictionary)"""
+    sizes = {}
+    for attribute in ("name_to_id", "word_to_id", "prefix_to_id"):
+        index = getattr(matcher, attribute)
+        total = sys.getsizeof(index)
+        for key, value in index.items():
+            total += sys.getsizeof(key)
+            if isinstance(value, list):
+                total += sys.getsizeof(value)
+        sizes[attribute] = total
+    return sizes
+
+
+def score(predictions: List[Optional[int]], queries: List[Query]) -> Dict[str, float]:
+    """Accuracy against the generator's labels
+
+    A known company must resolve to its own entity and a new one to None;
+    a wrong entity is a false match, None for a known company a miss.
+    """
+    correct = false_matches = misses = 0
+    for predicted, query in zip(predictions, queries):
+        if predicted == query.entity:
+            correct += 1
+        elif predicted is None:
+            misses += 1
+        else:
+            false_matches += 1
+    total = len(queries) or 1
+    return {
+        "accuracy": correct / total,
+        "false_match_rate": false_matches / total,
+        "miss_rate": misses / total
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def benchmark_size(
+    size: int,
+    query_count: int = 10_000,
+    seed: int = 7,
+    naive_sample: int = NAIVE_SAMPLE,
+    naive_max_names: int = NAIVE_MAX_NAMES
+) -> Dict[str, Any]:
+    """Build, lookup, batch and accuracy measurements for one corpus size"""
+    start = time.perf_counter()
+    corpus = NameGenerator(seed=seed).corpus(size, query_count)
+    generate_seconds = time.perf_counter() - start
+    queries = corpus.queries
+
+    start = time.perf_counter()
+    matcher = OptimizedNameMatcher(dict(corpus.known))
+    build_seconds = time.perf_counter() - start
+    memory = index_memory(matcher)
+
+    # Per-lookup latency, then the same lookups as one batch without timer overhead
+    latencies = []
+    predictions = []
+    for query in queries:
+        begin = time.perf_counter_ns()
+        predictions.append(matcher.find_matching_id_optimized(query.name))
+        latencies.append((time.perf_counter_ns() - begin) / 1000)
+    start = time.perf_counter()
+    for query in queries:
+        matcher.find_matching_id_optimized(query.name)
+    lookup_seconds = time.perf_counter() - start
+
+    result = {
+        "size": size,
+        "queries": len(queries),
+        "generate_seconds": generate_seconds,
+        "build_seconds": build_seconds,
+        "build_names_per_second": size / build_seconds,
+        "lookup_us": percentiles(latencies),
+        "lookups_per_second": len(queries) / lookup_seconds,
+        "index_bytes": memory,
+        "index_keys": {
+            "name_to_id": len(matcher.name_to_id),
+            "word_to_id": len(matcher.word_to_id),
+            "prefix_to_id": len(matcher.prefix_to_id)
+        },
+        "optimized": score(predictions, queries)
+    }
+
+    if size <= naive_max_names and naive_sample:
+        sample = queries[:naive_sample]
+        start = time.perf_counter()
+        naive = NaiveNameMatcher(corpus.known)
+        naive_build = time.perf_counter() - start
+        start = time.perf_counter()
+        naive_predictions = [naive.find_matching_id(query.name) for query in sample]
+        naive_seconds = time.perf_counter() - start
+        result["naive"] = dict(
+            score(naive_predictions, sample),
+            sample=len(sample),
+            build_seconds=naive_build,
+            lookups_per_second=len(sample) / naive_seconds,
+            agreement=sum(a == b for a, b in zip(naive_predictions, predictions)) / len(sample)
+        )
+
+    # process_new_names adds every name it resolves to the dictionary, so it runs last
+    start = time.perf_counter()
+    matcher.process_new_names([query.name for query in queries])
+    result["batch_names_per_second"] = len(queries) / (time.perf_counter() - start)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result: Dict[str, Any]):
+    latency = result["lookup_us"]
+    memory_mb = {name: size / 1e6 for name, size in result["index_bytes"].items()}
+    print(f"\n{result['size']:,} known names, {result['queries']:,} queries:")
+    print(f"  • Build: {result['build_seconds']:.2f} s ({result['build_names_per_second']:,.0f} names/sec)")
+    print(f"  • Lookup: p50 {latency['p50']:.1f} µs, p99 {latency['p99']:.1f} µs, max {latency['max']:.0f} µs "
+          f"({result['lookups_per_second']:,.0f}/sec; process_new_names {result['batch_names_per_second']:,.0f}/sec)")
+    print(f"  • Index memory: word_to_id {memory_mb['word_to_id']:.1f} MB, "
+          f"prefix_to_id {memory_mb['prefix_to_id']:.1f} MB, name_to_id {memory_mb['name_to_id']:.1f} MB "
+          f"(peak RSS {result['peak_rss_mb']:.0f} MB)")
+    optimized = result["optimized"]
+    print(f"  • Optimized accuracy: {optimized['accuracy']:.1%} "
+          f"(false matches {optimized['false_match_rate']:.1%}, misses {optimized['miss_rate']:.1%})")
+    naive = result.get("naive")
+    if naive:
+        print(f"  • Naive baseline ({naive['sample']} queries): accuracy {naive['accuracy']:.1%}, "
+              f"{naive['lookups_per_second']:,.1f} lookups/sec, agreement {naive['agreement']:.1%}")
+
+
+def compare_runs(results_path: str = RESULTS_PATH):
+    """Compare the latest run with the previous one, size by size"""
+    with open(results_path) as f:
+        runs = [json.loads(line) for line in f if line.strip()]
+    if len(runs) < 2:
+        return
+    previous = {result["size"]: result for result in runs[-2]["results"]}
+    common = [result for result in runs[-1]["results"] if result["size"] in previous]
+    if common:
+        print(f"\nChange vs. previous run ({runs[-2]['commit']} -> {runs[-1]['commit']}):")
+    for result in common:
+        before = previous[result["size"]]
+        print(f"  • {result['size']:>10,}: build {result['build_seconds'] / before['build_seconds'] - 1:+.0%}, "
+              f"p50 lookup {result['lookup_us']['p50'] / before['lookup_us']['p50'] - 1:+.0%}, "
+              f"index bytes {sum(result['index_bytes'].values()) / sum(before['index_bytes'].values()) - 1:+.0%}, "
+              f"accuracy {result['optimized']['accuracy'] - before['optimized']['accuracy']:+.1%}")
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, query_count: int = 10_000, results_path: str = RESULTS_PATH, **options):
+    """Benchmark each corpus size and append the run to results_path (JSON lines)
+
+    prefix_to_id dominates memory at roughly 2.2 GB per million names, so
+    10M-name runs need a machine with ~32 GB of RAM.
+    """
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": []
+    }
+    for size in sizes:
+        result = benchmark_size(size, query_count, **options)
+        print_result(result)
+        run["results"].append(result)
+
+    if results_path:
+        with open(results_path, "a") as f:
+            f.write(json.dumps(run) + "\n")
+        compare_runs(results_path)
+    return run
+
+
+if __name__ == "__main__":
+    # python name_matching_benchmark.py [size ...], e.g. 10000 100000 1000000 10000000
+    run_benchmark([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,399 @@
+# Pain Point Extraction Pipeline
+# Index-time extraction of pain points, sentiment and urgency in a worker pool, with resumable checkpoints
+
+import json
+import math
+import os
+import re
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from document_chunker import DEFAULT_CHUNK_OVERLAP, DEFAULT_CHUNK_SIZE, chunk_text_stream, get_tokenizer
+
+# Issue categories, checked per sentence; the earliest match in a sentence wins
+ISSUE_PATTERNS = {
+    "billing": r"\b(?:bill(?:s|ing|ed)?|invoices?|invoiced|charges?|charged|overcharg\w*|refunds?|pricing|payments?)\b",
+    "access": r"\b(?:log ?in|sign ?in|passwords?|locked out|access|permissions?|sso|authenticat\w*)\b",
+    "performance": r"\b(?:slow\w*|latency|timeouts?|timed out|lag\w*|hangs?|freez\w*|performance)\b",
+    "reliability": r"\b(?:outages?|down ?time|crash\w*|errors?|bugs?|broken|unavailable)\b",
+    "integration": r"\b(?:integrations?|api|sync\w*|webhooks?|connectors?|imports?|exports?)\b",
+    "support": r"\b(?:no (?:response|reply)|unanswered|escalat\w*|support tickets?|tickets?)\b"
+}
+ISSUE_REGEXES = {category: re.compile(pattern, re.IGNORECASE) for category, pattern in ISSUE_PATTERNS.items()}
+
+# A sentence is a pain point only if it also describes a problem
+PROBLEM_PATTERN = re.compile(
+    r"\b(?:can(?:no|')t|cannot|unable|not working|does(?:n't| not)|won't|fail\w*|issues?|problems?|errors?|"
+    r"incorrect\w*|wrong\w*|broken|frustrat\w*|discrepanc\w*|delay\w*|slow\w*|crash\w*|outages?|no (?:response|reply))\b",
+    re.IGNORECASE
+)
+HIGH_SEVERITY_PATTERN = re.compile(
+    r"\b(?:critical|urgent|outages?|down|blocking|blocked|cannot|can't|unable|lost|revenue|security|all (?:users|of us))\b",
+    re.IGNORECASE
+)
+LOW_SEVERITY_PATTERN = re.compile(r"\b(?:minor|slight(?:ly)?|cosmetic|occasional(?:ly)?|small)\b", re.IGNORECASE)
+RECURRING_PATTERN = re.compile(
+    r"\b(?:again|every|each (?:month|week|day)|repeated(?:ly)?|recurring|past (?:\w+ )?(?:months|weeks))\b",
+    re.IGNORECASE
+)
+PERSISTENT_PATTERN = re.compile(r"\b(?:still|since|ongoing|continu\w*|for (?:days|weeks))\b", re.IGNORECASE)
+
+URGENCY_CUES = {
+    re.compile(r"\b(?:urgent(?:ly)?|asap|immediately|critical|emergency)\b", re.IGNORECASE): 0.3,
+    re.compile(r"\b(?:deadline|today|tomorrow|blocking|escalat\w*|as soon as possible)\b", re.IGNORECASE): 0.2
+}
+
+NEGATIVE_WORDS = {
+    "angry", "annoyed", "awful", "bad", "broken", "disappointed", "disappointing", "error", "fail", "failed",
+    "failing", "frustrated", "frustrating", "horrible", "incorrect", "incorrectly", "issue", "poor", "problem", "slow",
+    "terrible", "unacceptable", "unhappy", "useless", "worse", "worst", "wrong"
+}
+POSITIVE_WORDS = {
+    "appreciate", "excellent", "fast", "fixed", "glad", "good", "great", "happy", "helpful", "love",
+    "pleased", "quick", "resolved", "satisfied", "smooth", "thank", "thanks", "works"
+}
+NEGATORS = {"not", "no", "never", "don't", "doesn't", "isn't", "wasn't", "aren't", "can't", "won't"}
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD_PATTERN = re.compile(r"[a-z']+")
+MAX_DESCRIPTION_CHARS = 200
+
+CHECKPOINT_PATH = "pain_point_extraction.checkpoint.jsonl"
+
+
+class RuleBasedExtractor:
+    """Keyword/regex pain point, sentiment and urgency extractor
+
+    Any picklable object with the same extract(text) -> dict method can be
+    used instead, e.g. a wrapper around a local classification model.
+    """
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        pain_points = []
+        for sentence in SENTENCE_PATTERN.split(text):
+            sentence = sentence.strip()
+            if not sentence or not PROBLEM_PATTERN.search(sentence):
+                continue
+            matches = [(regex.search(sentence), category) for category, regex in ISSUE_REGEXES.items()]
+            matches = [(match.start(), category) for match, category in matches if match]
+            if not matches:
+                continue
+            pain_points.append({
+                "description": sentence[:MAX_DESCRIPTION_CHARS],
+                "category": min(matches)[1],
+                "severity": _severity(sentence),
+                "frequency": _frequency(sentence)
+            })
+
+        return {
+            "pain_points": pain_points,
+            "sentiment_score": _sentiment(text),
+            "urgency_score": _urgency(text, pain_points)
+        }
+
+
+def _severity(sentence: str) -> str:
+    if HIGH_SEVERITY_PATTERN.search(sentence):
+        return "high"
+    if LOW_SEVERITY_PATTERN.search(sentence):
+        return "low"
+    return "medium"
+
+
+def _frequency(sentence: str) -> str:
+    if RECURRING_PATTERN.search(sentence):
+        return "recurring"
+    if PERSISTENT_PATTERN.search(sentence):
+        return "persistent"
+    return "one_time"
+
+
+def _sentiment(text: str) -> float:
+    """Lexicon score in (-1, 1); a negator within the three preceding words flips polarity"""
+    words = WORD_PATTERN.findall(text.lower())
+    positive = negative = 0
+    for i, word in enumerate(words):
+        polarity = 1 if word in POSITIVE_WORDS else -1 if word in NEGATIVE_WORDS else 0
+        if not polarity:
+            continue
+        if any(previous in NEGATORS for previous in words[max(0, i - 3):i]):
+            polarity = -polarity
+        if polarity > 0:
+            positive += 1
+        else:
+            negative += 1
+    return round((positive - negative) / (positive + negative + 1), 3)
+
+
+def _urgency(text: str, pain_points: List[Dict[str, Any]]) -> float:
+    score = sum(weight for regex, weight in URGENCY_CUES.items() if regex.search(text))
+    score += min(text.count("!"), 3) * 0.05
+    if any(point["severity"] == "high" for point in pain_points):
+        score += 0.3
+    return round(min(1.0, score), 3)
+
+
+def sentiment_label(score: float) -> str:
+    if score <= -0.2:
+        return "negative"
+    if score >= 0.2:
+        return "positive"
+    return "neutral"
+
+
+def merge_chunk_extractions(extractions: List[Dict[str, Any]], weights: List[int]) -> Dict[str, Any]:
+    """Combine per-chunk results into communication-level metadata
+
+    Pain points are deduplicated by description (chunk overlap repeats
+    sentences), sentiment is the weighted mean and urgency the maximum.
+    """
+    pain_points, seen = [], set()
+    for extraction in extractions:
+        for point in extraction["pain_points"]:
+            key = point["description"].lower()
+            if key not in seen:
+                seen.add(key)
+                pain_points.append(point)
+
+    total = sum(weights) or 1
+    sentiment = sum(e["sentiment_score"] * w for e, w in zip(extractions, weights)) / total
+    urgency = max((e["urgency_score"] for e in extractions), default=0.0)
+    categories = Counter(point["category"] for point in pain_points)
+
+    metadata = {
+        "extracted_pain_points": pain_points,
+        "sentiment_score": round(sentiment, 3),
+        "sentiment_label": sentiment_label(sentiment),
+        "urgency_score": urgency,
+        "priority": "high" if urgency >= 0.6 else "medium" if urgency >= 0.3 else "low",
+        "tags": sorted(f"{category}_issue" for category in categories)
+    }
+    if categories:
+        metadata["issue_type"] = categories.most_common(1)[0][0]
+    return metadata
+
+
+class ExtractionCheckpoint:
+    """Append-only JSONL record of parent documents that were extracted and indexed"""
+
+    def __init__(self, path: str = CHECKPOINT_PATH):
+        self.path = path
+        self.completed: Set[str] = set()
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            valid_bytes = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn final line from a crash mid-write
+                try:
+                    self.completed.add(json.loads(line)["parent_document_id"])
+                except (ValueError, KeyError):
+                    break
+                valid_bytes += len(line)
+            f.truncate(valid_bytes)  # Later records must not be appended to a torn line
+
+    def record(self, entries: List[Dict[str, Any]]):
+        """Durably mark parents as done (flushed and fsynced before returning)"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.update(entry["parent_document_id"] for entry in entries)
+
+
+# Per-process worker state, set once by the pool initializer instead of pickled per task
+_worker = {}
+
+
+def _init_worker(extractor, chunk_size: int, overlap: int):
+    _worker["extractor"] = extractor
+    _worker["chunk_size"] = chunk_size
+    _worker["overlap"] = overlap
+    _worker["tokenizer"] = get_tokenizer()
+
+
+def _extract_communication(parent_doc_id: str, content: str):
+    """Chunk one communication and run the extractor over each chunk"""
+    chunks = list(chunk_text_stream(content, _worker["chunk_size"], _worker["overlap"], _worker["tokenizer"]))
+    extractions = [_worker["extractor"].extract(chunk.text) for chunk in chunks]
+    merged = merge_chunk_extractions(extractions, [chunk.token_count for chunk in chunks])
+    return parent_doc_id, [(chunk.index, chunk.text, chunk.overlap_with_next) for chunk in chunks], merged
+
+
+def _iter_extracted(
+    communications: Iterable[Tuple[str, Dict[str, Any], str]],
+    workers: int,
+    initargs: Tuple
+) -> Iterator[Tuple[Dict[str, Any], Tuple]]:
+    """Yield (metadata, extraction result) in completion order with a bounded number of tasks in flight"""
+    if workers == 0:
+        _init_worker(*initargs)
+        for parent_doc_id, metadata, content in communications:
+            yield metadata, _extract_communication(parent_doc_id, content)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        communications = iter(communications)
+        in_flight = {}
+
+        def submit_next() -> bool:
+            item = next(communications, None)
+            if item is None:
+                return False
+            parent_doc_id, metadata, content = item
+            in_flight[executor.submit(_extract_communication, parent_doc_id, content)] = metadata
+            return True
+
+        while len(in_flight) < workers * 4 and submit_next():
+            pass
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), future.result()
+                submit_next()
+
+
+def run_extraction_pipeline(
+    communications: Iterable[Tuple[str, Dict[str, Any], str]],
+    index_manager,
+    embed_fn: Callable[[str], List[float]],
+    extractor=None,
+    checkpoint_path: str = CHECKPOINT_PATH,
+    workers: int = None,
+    batch_size: int = 1000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> Dict[str, Any]:
+    """Extract, embed and index communications, resuming after the last checkpoint
+
+    communications: iterable of (parent_doc_id, metadata, content string).
+    Extraction runs in `workers` processes (0 runs inline); extracted values
+    only fill metadata keys the caller did not already provide. Documents are
+    uploaded in batches of batch_size and a parent is checkpointed once all
+    of its chunks are indexed, so a rerun skips exactly the finished parents.
+    """
+    extractor = extractor or RuleBasedExtractor()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    checkpoint = ExtractionCheckpoint(checkpoint_path)
+    builder = index_manager.document_builder
+
+    stats = {"skipped": 0, "parents": 0, "chunks": 0, "pain_points": 0}
+    pending_docs: List[Dict[str, Any]] = []
+    pending_parents: List[Dict[str, Any]] = []
+
+    def flush():
+        for start in range(0, len(pending_docs), batch_size):
+            index_manager.index_documents(pending_docs[start:start + batch_size])
+        checkpoint.record(pending_parents)
+        pending_docs.clear()
+        pending_parents.clear()
+
+    def remaining():
+        for parent_doc_id, metadata, content in communications:
+            if parent_doc_id in checkpoint.completed:
+                stats["skipped"] += 1
+                continue
+            yield parent_doc_id, metadata, content
+
+    start = time.perf_counter()
+    for metadata, (parent_doc_id, chunks, extracted) in _iter_extracted(
+        remaining(), workers, (extractor, chunk_size, overlap)
+    ):
+        merged = {**extracted, **metadata}
+        additional_metadata = merged.get("additional_metadata", {})
+        merged["additional_metadata"] = {**additional_metadata, "extractor": type(extractor).__name__}
+        pending_docs.extend(builder.iter_documents(
+            parent_doc_id,
+            merged,
+            ((index, text, embed_fn(text), {"overlap_with_next": overlap_with_next})
+             for index, text, overlap_with_next in chunks)
+        ))
+        pending_parents.append({"parent_document_id": parent_doc_id, "chunks": len(chunks)})
+
+        stats["parents"] += 1
+        stats["chunks"] += len(chunks)
+        stats["pain_points"] += len(extracted["extracted_pain_points"])
+        if len(pending_docs) >= batch_size:
+            flush()
+
+    if pending_parents:
+        flush()
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def _hash_embedding(text: str, dimensions: int = 256) -> List[float]:
+    """Deterministic stand-in for the embedding service"""
+    vector = [0.0] * dimensions
+    for word in WORD_PATTERN.findall(text.lower()):
+        vector[zlib.crc32(word.encode()) % dimensions] += 1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _synthetic_communications(count: int, sentences: int = 120):
+    templates = [
+        "We have been charged incorrectly on every invoice for the past three months.",
+        "Our finance team still cannot log in to the billing dashboard.",
+        "The reporting export is slow and times out for large accounts!",
+        "The API sync failed again last night and we lost orders.",
+        "Thanks for the quick help with the onboarding call, it was great.",
+        "There has been no response on our support ticket since last week.",
+        "This is urgent, the outage is blocking all users today.",
+        "Minor issue: the logo looks slightly off on the invoice PDF."
+    ]
+    for i in range(count):
+        content = " ".join(templates[(i + j) % len(templates)] for j in range(sentences))
+        yield f"EXTRACT-{i}", {"customer_id": f"CUST-{i % 50:05d}", "communication_type": "email"}, content
+
+
+def benchmark_extraction(communication_count: int = 400, workers: int = None):
+    """Time inline vs. pooled extraction against a local emulator, then check that a rerun resumes"""
+    import tempfile
+
+    from azure_ai_search_schema import PainPointSearchIndexManager
+    from search_service_emulator import start_in_subprocess
+    from vector_compression import VectorCompressionConfig
+
+    workers = workers or os.cpu_count() or 1
+    process, endpoint = start_in_subprocess()
+    try:
+        manager = PainPointSearchIndexManager(
+            vector_config=VectorCompressionConfig(dimensions=256),
+            endpoint=endpoint,
+            credential="emulator-key",
+            index_name="pain-points-extraction"
+        )
+        manager.create_or_update_index()
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = {}
+            for label, pool_size in (("inline", 0), (f"{workers} workers", workers)):
+                path = os.path.join(directory, f"{pool_size}.jsonl")
+                stats = run_extraction_pipeline(
+                    _synthetic_communications(communication_count), manager, _hash_embedding,
+                    checkpoint_path=path, workers=pool_size
+                )
+                results[label] = stats
+            resumed = run_extraction_pipeline(
+                _synthetic_communications(communication_count), manager, _hash_embedding,
+                checkpoint_path=path, workers=workers
+            )
+    finally:
+        process.terminate()
+
+    print(f"Extracted and indexed {communication_count:,} communications:")
+    for label, stats in results.items():
+        print(f"  • {label:>10}: {stats['seconds']:.2f}s, {stats['chunks']:,} chunks, {stats['pain_points']:,} pain points")
+    print(f"  • Rerun from checkpoint: skipped {resumed['skipped']:,}, processed {resumed['parents']:,}")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_extraction()
@@ -0,0 +1,101 @@
+# Parent Document Collapsing
+# Groups chunk hits by parent document, merges adjacent chunks and drops near-duplicate content
+
+import re
+import zlib
+from typing import Any, Dict, List, Set
+
+COLLAPSE_FIELDS = ["id", "parent_document_id", "chunk_index", "content"]
+DEFAULT_DEDUP_THRESHOLD = 0.9  # Jaccard similarity of word shingles
+SHINGLE_SIZE = 4  # Words per shingle
+MAX_OVERLAP_WORDS = 256  # Longest chunk overlap searched when merging neighbours
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _shingles(text: str) -> Set[int]:
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode())
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def join_overlapping(first: str, second: str) -> str:
+    """Concatenate consecutive chunks, dropping the words the chunker repeated in both"""
+    first_words = first.split()
+    second_words = second.split()
+    for size in range(min(len(first_words), len(second_words), MAX_OVERLAP_WORDS), 0, -1):
+        if first_words[-size:] == second_words[:size]:
+            return first.rstrip() + " " + " ".join(second_words[size:])
+    return first.rstrip() + " " + second.lstrip()
+
+
+def _merge_window(best: Dict[str, Any], chunks: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Extend the best chunk with the contiguous run of retrieved neighbours around it"""
+    start = end = best.get("chunk_index")
+    if start is None:
+        return dict(best, chunk_indexes=[])
+    while start - 1 in chunks:
+        start -= 1
+    while end + 1 in chunks:
+        end += 1
+
+    content = chunks[start].get("content") or ""
+    for index in range(start + 1, end + 1):
+        content = join_overlapping(content, chunks[index].get("content") or "")
+
+    merged = dict(best)
+    merged["content"] = content
+    merged["chunk_indexes"] = list(range(start, end + 1))
+    return merged
+
+
+def collapse_by_parent(
+    hits: List[Dict[str, Any]],
+    top_k: int,
+    merge_adjacent: bool = True,
+    dedup_threshold: float = DEFAULT_DEDUP_THRESHOLD,
+    seen_shingles: List[Set[int]] = None
+) -> List[Dict[str, Any]]:
+    """Collapse ranked chunk hits into at most top_k distinct documents
+
+    Hits must be in score order. Each parent keeps its best-scoring chunk
+    (merged with adjacent retrieved chunks when merge_adjacent), and a
+    document whose content nearly duplicates a higher-ranked one is dropped.
+    seen_shingles carries dedup state across calls.
+    """
+    groups: Dict[str, Dict[int, Dict[str, Any]]] = {}
+    order: List[str] = []
+    for hit in hits:
+        parent = hit.get("parent_document_id") or hit["id"]
+        if parent not in groups:
+            groups[parent] = {}
+            order.append(parent)
+        groups[parent].setdefault(hit.get("chunk_index"), hit)
+
+    seen = seen_shingles if seen_shingles is not None else []
+    documents = []
+    for parent in order:
+        chunks = groups[parent]
+        best = next(iter(chunks.values()))
+        document = _merge_window(best, chunks) if merge_adjacent else dict(best, chunk_indexes=[best.get("chunk_index")])
+        document["matched_chunks"] = len(chunks)
+
+        shingles = _shingles(best.get("content") or "")
+        if any(_jaccard(shingles, previous) >= dedup_threshold for previous in seen):
+            continue
+        seen.append(shingles)
+
+        documents.append(document)
+        if len(documents) == top_k:
+            break
+    return documents
@@ -0,0 +1,265 @@
+# Search Result Cache
+# LRU + TTL cache for hybrid_search results with customer-scoped invalidation
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from search_filters import compile_filter
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_VECTOR_PRECISION = 3  # Decimal places kept when hashing query vectors
+KEY_PREFIX = "pp:"
+GLOBAL_GENERATION = "*"  # Bumped on every write; used by queries without a customer filter
+INDEX_GENERATION = "index:{}"  # Bumped when an index's layout changes; used by every query on it
+
+
+class MemoryCacheBackend:
+    """In-process LRU store with per-entry expiry
+
+    Exposes the subset of the redis-py API used by SearchResultCache
+    (get / set(ex=) / delete / incr), so a redis.Redis client can be used
+    in its place for a cache shared across workers.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._counters: Dict[str, int] = {}  # Never evicted, unlike cached results
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key])
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ex: int = None):
+        expires_at = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += self._entries.pop(key, None) is not None
+                removed += self._counters.pop(key, None) is not None
+            return removed
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class DiskCacheBackend:
+    """SQLite-backed store shared by processes on the same host"""
+
+    PRUNE_EVERY = 256  # Writes between sweeps of expired rows
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER)"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                return str(row[0])
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: str, ex: int = None):
+        expires_at = time.time() + ex if ex else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += self._conn.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount
+                removed += self._conn.execute("DELETE FROM counters WHERE key = ?", (key,)).rowcount
+            return removed
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO counters (key, value) VALUES (?, 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + 1",
+                (key,)
+            )
+            return self._conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of the query text"""
+    return " ".join((query or "").lower().split())
+
+
+def hash_vector(vector: Optional[List[float]], precision: int = DEFAULT_VECTOR_PRECISION) -> str:
+    """Hash a query vector after rounding, so float noise maps to the same key"""
+    if not vector:
+        return ""
+    scale = 10 ** precision
+    quantized = array("q", (round(value * scale) for value in vector))
+    return hashlib.blake2b(quantized.tobytes(), digest_size=16).hexdigest()
+
+
+def canonical_filters(filters: Optional[Dict[str, Any]]) -> str:
+    """Order-independent filter expression (compile_filter sorts keys and list values)"""
+    return compile_filter(filters) or ""
+
+
+def _customer_ids(filters: Optional[Dict[str, Any]]) -> List[str]:
+    customer_id = (filters or {}).get("customer_id")
+    if customer_id is None:
+        return []
+    if isinstance(customer_id, (list, tuple, set)):
+        return sorted(str(value) for value in customer_id)
+    return [str(customer_id)]
+
+
+class SearchResultCache:
+    """Caches search results keyed on query, vector, filters, top_k and fields
+
+    Invalidation is generation based: every cache key embeds the write
+    generation of the customers its filters are scoped to (or the global
+    generation when unscoped), plus that of its index, so
+    invalidate_customers and invalidate_index never scan entries and work
+    the same across a shared backend.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        vector_precision: int = DEFAULT_VECTOR_PRECISION
+    ):
+        if not ttl > 0:
+            # ex=0 means "never expires" to the memory backend and is rejected by Redis
+            raise ValueError(f"ttl must be greater than 0 seconds, got {ttl!r}")
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries)
+        self.ttl = ttl
+        self.vector_precision = vector_precision
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._stats_lock = threading.Lock()  # hybrid_search runs on batch_search worker threads
+
+    def _generation(self, scope: str) -> str:
+        value = self.backend.get(f"{KEY_PREFIX}gen:{scope}")
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value or "0"
+
+    def make_key(
+        self,
+        query: str,
+        query_vector: Optional[List[float]],
+        filters: Optional[Dict[str, Any]],
+        top_k: int,
+        select: Iterable[str],
+        index_name: str = ""
+    ) -> str:
+        """Build the cache key for a search call
+
+        index_name keeps searchers on different indexes apart when they
+        share a backend.
+        """
+        scopes = (_customer_ids(filters) or [GLOBAL_GENERATION]) + [INDEX_GENERATION.format(index_name or "")]
+        generations = ",".join(f"{scope}={self._generation(scope)}" for scope in scopes)
+        raw = "\x1f".join([
+            index_name or "",
+            normalize_query(query),
+            hash_vector(query_vector, self.vector_precision),
+            canonical_filters(filters),
+            str(top_k),
+            ",".join(sorted(select)),
+            generations
+        ])
+        return f"{KEY_PREFIX}res:" + hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        value = self.backend.get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, results: List[Dict[str, Any]]):
+        self.backend.set(key, json.dumps(results, default=str), ex=math.ceil(self.ttl))
+
+    def invalidate_customers(self, customer_ids: Iterable[str]):
+        """Expire cached results that may contain documents of these customers"""
+        for customer_id in {str(customer_id) for customer_id in customer_ids if customer_id is not None}:
+            self.backend.incr(f"{KEY_PREFIX}gen:{customer_id}")
+        self.backend.incr(f"{KEY_PREFIX}gen:{GLOBAL_GENERATION}")
+        with self._stats_lock:
+            self.invalidations += 1
+
+    def invalidate_index(self, index_name: str = ""):
+        """Expire every cached result of an index, e.g. after partitions are dropped or moved"""
+        self.backend.incr(f"{KEY_PREFIX}gen:{INDEX_GENERATION.format(index_name or '')}")
+        with self._stats_lock:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics since the cache was created"""
+        with self._stats_lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "invalidations": invalidations,
+            "evictions": getattr(self.backend, "evictions", None)
+        }
@@ -0,0 +1,52 @@
+# Pain Point Index Field Catalog
+# Field lists shared by the Azure and local search paths (no SDK imports)
+
+# Fields returned by each search type
+HYBRID_SEARCH_FIELDS = [
+    "id", "content", "customer_id", "customer_name",
+    "customer_tier", "product_name", "issue_type",
+    "sentiment_label", "pain_points", "communication_date",
+    "subject", "priority", "tags"
+]
+PAIN_POINT_SEARCH_FIELDS = [
+    "id", "content", "customer_tier", "product_name",
+    "pain_points", "sentiment_score", "urgency_score"
+]
+
+# Fields searched by keyword queries for pain point patterns
+PAIN_POINT_SEARCH_TEXT_FIELDS = ["content", "pain_points", "tags"]
+
+# Fields marked facetable in create_index_schema
+FACETABLE_FIELDS = [
+    "customer_id", "customer_name", "customer_tier", "customer_region",
+    "communication_type", "communication_date", "priority",
+    "product_id", "product_name", "product_category",
+    "issue_type", "issue_category", "sentiment_score",
+    "sentiment_label", "urgency_score", "tags"
+]
+DEFAULT_FACETS = ["customer_tier", "issue_type", "product_category", "sentiment_label", "tags"]
+
+# Range bucket boundaries for numeric facets
+SCORE_FACET_BOUNDARIES = {
+    "sentiment_score": [-0.6, -0.2, 0.2, 0.6],  # -1.0 to 1.0
+    "urgency_score": [0.25, 0.5, 0.75]  # 0.0 to 1.0
+}
+
+# Every retrievable field except the vector (metadata_json and pain_points hold JSON strings)
+RETRIEVABLE_FIELDS = [
+    "id", "content", "chunk_id", "chunk_index", "parent_document_id",
+    "customer_id", "customer_name", "customer_tier", "customer_region",
+    "communication_type", "communication_date", "subject", "priority",
+    "product_id", "product_name", "product_category",
+    "issue_type", "issue_category", "sentiment_score", "sentiment_label",
+    "urgency_score", "pain_points", "tags",
+    "processed_date", "processing_version", "metadata_json"
+]
+JSON_FIELDS = ["pain_points", "metadata_json"]
+
+# Named select lists for search calls
+FIELD_PROFILES = {
+    "ids": ["id", "parent_document_id", "chunk_index"],
+    "summary": HYBRID_SEARCH_FIELDS,
+    "full": RETRIEVABLE_FIELDS
+}
@@ -0,0 +1,232 @@
+# Pain Point Index Filter Compiler
+# Compiles filter dictionaries into escaped, memoized OData expressions and local predicates
+
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+STRING = "Edm.String"
+INT32 = "Edm.Int32"
+DOUBLE = "Edm.Double"
+DATETIME = "Edm.DateTimeOffset"
+STRING_COLLECTION = "Collection(Edm.String)"
+
+# Every filterable field in create_index_schema and its type
+FILTERABLE_FIELDS = {
+    "id": STRING,
+    "chunk_id": STRING,
+    "chunk_index": INT32,
+    "parent_document_id": STRING,
+    "customer_id": STRING,
+    "customer_name": STRING,
+    "customer_tier": STRING,
+    "customer_region": STRING,
+    "communication_type": STRING,
+    "communication_date": DATETIME,
+    "priority": STRING,
+    "product_id": STRING,
+    "product_name": STRING,
+    "product_category": STRING,
+    "issue_type": STRING,
+    "issue_category": STRING,
+    "sentiment_score": DOUBLE,
+    "sentiment_label": STRING,
+    "urgency_score": DOUBLE,
+    "tags": STRING_COLLECTION,
+    "processed_date": DATETIME,
+    "processing_version": STRING
+}
+
+RANGE_TYPES = (INT32, DOUBLE, DATETIME)
+
+# Shorthand keys kept for existing callers
+RANGE_ALIASES = {
+    "date_from": ("communication_date", "ge"),
+    "date_to": ("communication_date", "le")
+}
+
+SEARCH_IN_DELIMITERS = ("|", ",", ";", "~", "^")
+
+FilterClause = Tuple[str, str, Any]  # (operator, field, value)
+
+
+def normalize_datetime(value) -> datetime:
+    """Parse dates, datetimes and ISO strings into UTC datetimes (naive values are UTC)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _check_value(field: str, field_type: str, value):
+    """Validate and normalize a single filter value for its field type"""
+    if value is None:
+        return None
+    if field_type in (STRING, STRING_COLLECTION):
+        if not isinstance(value, str):
+            raise TypeError(f"Filter '{field}' expects a string, got {type(value).__name__}")
+        return value
+    if field_type in (INT32, DOUBLE):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"Filter '{field}' expects a number, got {type(value).__name__}")
+        if field_type == INT32 and not float(value).is_integer():
+            raise TypeError(f"Filter '{field}' expects an integer, got {value!r}")
+        return int(value) if field_type == INT32 else float(value)
+    if not isinstance(value, (str, date)):
+        raise TypeError(f"Filter '{field}' expects a datetime, got {type(value).__name__}")
+    return normalize_datetime(value)
+
+
+def _freeze(filters: Dict[str, Any]) -> Tuple:
+    """Hashable, order-independent form of a filter dictionary"""
+    frozen = []
+    for key, value in filters.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            value = ("__list__",) + tuple(sorted(set(value), key=repr))
+        frozen.append((key, value))
+    return tuple(sorted(frozen, key=lambda item: item[0]))
+
+
+@lru_cache(maxsize=1024)
+def _parse(frozen: Tuple) -> Tuple[FilterClause, ...]:
+    clauses: List[FilterClause] = []
+
+    for key, value in frozen:
+        is_list = isinstance(value, tuple) and value[:1] == ("__list__",)
+        values = value[1:] if is_list else None
+
+        if key in RANGE_ALIASES or key.endswith(("_min", "_max")):
+            if key in RANGE_ALIASES:
+                field, operator = RANGE_ALIASES[key]
+            else:
+                field, operator = key[:-4], "ge" if key.endswith("_min") else "le"
+            if FILTERABLE_FIELDS.get(field) not in RANGE_TYPES:
+                raise ValueError(f"Unsupported range filter '{key}'")
+            if is_list or value is None:
+                raise TypeError(f"Range filter '{key}' expects a single value")
+            clauses.append((operator, field, _check_value(key, FILTERABLE_FIELDS[field], value)))
+            continue
+
+        if key.endswith("_not") and FILTERABLE_FIELDS.get(key[:-4]) == STRING:
+            field = key[:-4]
+            checked = tuple(_check_value(key, STRING, item) for item in (values if is_list else (value,)))
+            clauses.append(("not_in", field, checked))
+            continue
+
+        field_type = FILTERABLE_FIELDS.get(key)
+        if field_type is None:
+            raise ValueError(f"Unsupported filter '{key}'")
+
+        if field_type == STRING_COLLECTION:
+            checked = tuple(_check_value(key, field_type, item) for item in (values if is_list else (value,)))
+            clauses.append(("any_in", key, checked))
+        elif is_list:
+            checked = tuple(_check_value(key, field_type, item) for item in values)
+            clauses.append(("in", key, checked))
+        else:
+            clauses.append(("eq", key, _check_value(key, field_type, value)))
+
+    return tuple(clauses)
+
+
+def parse_filters(filters: Optional[Dict[str, Any]]) -> Tuple[FilterClause, ...]:
+    """Validate a filter dictionary into (operator, field, value) clauses"""
+    if not filters:
+        return ()
+    return _parse(_freeze(filters))
+
+
+def odata_literal(value) -> str:
+    """Render a Python value as an OData literal"""
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return repr(value)
+
+
+def _search_in(variable: str, values: Tuple[str, ...]) -> Optional[str]:
+    """search.in() over string values, or None if every delimiter occurs in a value"""
+    for delimiter in SEARCH_IN_DELIMITERS:
+        if not any(delimiter in value for value in values):
+            joined = delimiter.join(values)
+            return f"search.in({variable}, {odata_literal(joined)}, '{delimiter}')"
+    return None
+
+
+def _render(clause: FilterClause) -> str:
+    operator, field, value = clause
+
+    if operator == "any_in":
+        expression = _search_in("t", value) or " or ".join(f"t eq {odata_literal(item)}" for item in value)
+        return f"{field}/any(t: {expression})"
+
+    if operator == "not_in":
+        if not value:
+            return "true"
+        return "not " + _render(("in", field, value)) if len(value) > 1 else f"{field} ne {odata_literal(value[0])}"
+
+    if operator == "in":
+        if not value:
+            return "false"
+        if FILTERABLE_FIELDS[field] == STRING and None not in value:
+            expression = _search_in(field, value)
+            if expression:
+                return expression
+        return "(" + " or ".join(f"{field} eq {odata_literal(item)}" for item in value) + ")"
+
+    return f"{field} {operator} {odata_literal(value)}"
+
+
+@lru_cache(maxsize=1024)
+def _compile(frozen: Tuple) -> Optional[str]:
+    parts = [_render(clause) for clause in _parse(frozen)]
+    return " and ".join(parts) if parts else None
+
+
+def compile_filter(filters: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Compile a filter dictionary into an OData $filter expression
+
+    Keys are filterable field names (a list value matches any of them),
+    `<field>_min` / `<field>_max` for numeric and date ranges,
+    `<field>_not` to exclude string values, and the
+    `date_from` / `date_to` aliases for communication_date. Results are
+    memoized, so repeated dashboard filters are a dictionary lookup.
+    """
+    if not filters:
+        return None
+    return _compile(_freeze(filters))
+
+
+def _matches_clause(doc: Dict[str, Any], clause: FilterClause) -> bool:
+    operator, field, value = clause
+    actual = doc.get(field)
+
+    if operator == "any_in":
+        return any(tag in value for tag in actual or ())
+    if actual is not None and FILTERABLE_FIELDS[field] == DATETIME:
+        actual = normalize_datetime(actual)
+    if operator == "eq":
+        return actual == value
+    if operator == "in":
+        return actual in value
+    if operator == "not_in":
+        return actual not in value
+    if actual is None:
+        return False
+    return actual >= value if operator == "ge" else actual <= value
+
+
+def matches_clauses(doc: Dict[str, Any], clauses: Tuple[FilterClause, ...]) -> bool:
+    """Evaluate parsed clauses against a document, as the search service would"""
+    return all(_matches_clause(doc, clause) for clause in clauses)
+
+
+def matches_filters(doc: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a filter dictionary against a document"""
+    return matches_clauses(doc, parse_filters(filters))
@@ -0,0 +1,189 @@
+# Search Load Test
+# p50/p99 latency and throughput of indexing and querying through the RAG stack
+
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple
+
+from azure_ai_search_schema import PainPointRAGSearcher, PainPointSearchIndexManager
+from vector_compression import VectorCompressionConfig
+
+CUSTOMER_TIERS = ["enterprise", "mid_market", "smb"]
+ISSUE_TYPES = ["billing", "login", "performance", "integration", "reporting"]
+VOCABULARY = (
+    "billing invoice charge refund login password access dashboard slow timeout error "
+    "integration api export report sync outage crash upgrade license renewal support"
+).split()
+
+
+class LoadTestReport(NamedTuple):
+    """Latency percentiles and throughput of one operation"""
+    operation: str
+    requests: int
+    errors: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    throughput: float  # Items (documents or queries) per second
+    items: int
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def measure(
+    operation: str,
+    call: Callable[[Any], int],
+    work: Iterable[Any],
+    concurrency: int
+) -> LoadTestReport:
+    """Run call over work items on a thread pool; call returns the number of items it handled"""
+    latencies: List[float] = []
+    errors = 0
+    items = 0
+
+    def timed(item):
+        start = time.perf_counter()
+        count = call(item)
+        return time.perf_counter() - start, count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(timed, item) for item in work]
+        for future in futures:
+            try:
+                latency, count = future.result()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(latency)
+            items += count
+    elapsed = time.perf_counter() - start
+
+    return LoadTestReport(
+        operation=operation,
+        requests=len(futures),
+        errors=errors,
+        seconds=elapsed,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        throughput=items / elapsed if elapsed else 0.0,
+        items=items
+    )
+
+
+def _random_vector(rng: random.Random, dimensions: int) -> List[float]:
+    return [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+
+
+def _synthetic_communications(count: int, dimensions: int, seed: int = 11):
+    """(parent_doc_id, metadata, chunks) entries for DocumentBuilder.iter_batch"""
+    rng = random.Random(seed)
+    start_date = datetime(2025, 1, 1)
+    for i in range(count):
+        issue = rng.choice(ISSUE_TYPES)
+        content = f"{issue} " + " ".join(rng.choice(VOCABULARY) for _ in range(40))
+        metadata = {
+            "customer_id": f"CUST-{rng.randrange(500):05d}",
+            "customer_tier": rng.choice(CUSTOMER_TIERS),
+            "communication_type": "email",
+            "communication_date": start_date + timedelta(hours=rng.randrange(24 * 365)),
+            "issue_type": issue,
+            "sentiment_score": rng.uniform(-1.0, 1.0),
+            "urgency_score": rng.random(),
+            "tags": [issue]
+        }
+        yield f"LOAD-{i}", metadata, [(0, content, _random_vector(rng, dimensions))]
+
+
+def run_load_test(
+    endpoint: str = None,
+    credential=None,
+    index_name: str = "pain-points-load-test",
+    document_count: int = 5000,
+    batch_size: int = 250,
+    query_count: int = 1000,
+    concurrency: int = 16,
+    dimensions: int = 256,
+    client_options: Dict[str, Any] = None,
+    seed: int = 11
+) -> List[LoadTestReport]:
+    """Create an index, upload synthetic documents concurrently, then run concurrent hybrid queries
+
+    Point endpoint at a SearchServiceEmulator (or a disposable test service);
+    client_options is passed to the SDK clients, e.g. {"retry_total": 0} to
+    surface injected errors instead of retrying them.
+    """
+    vector_config = VectorCompressionConfig(dimensions=dimensions)
+    manager = PainPointSearchIndexManager(
+        vector_config=vector_config,
+        endpoint=endpoint,
+        credential=credential,
+        index_name=index_name,
+        client_options=client_options
+    )
+    manager.create_or_update_index()
+
+    documents = list(manager.document_builder.iter_batch(_synthetic_communications(document_count, dimensions, seed)))
+    batches = [documents[start:start + batch_size] for start in range(0, len(documents), batch_size)]
+
+    def upload(batch):
+        results = manager.search_client.upload_documents(documents=batch)
+        return sum(1 for result in results if result.succeeded)
+
+    reports = [measure("index", upload, batches, concurrency)]
+
+    searcher = PainPointRAGSearcher(
+        vector_config=vector_config,
+        endpoint=endpoint,
+        credential=credential,
+        index_name=index_name,
+        client_options=client_options
+    )
+    rng = random.Random(seed + 1)
+    queries = [
+        (
+            " ".join(rng.choice(VOCABULARY) for _ in range(3)),
+            _random_vector(rng, dimensions),
+            {"customer_tier": rng.choice(CUSTOMER_TIERS)} if rng.random() < 0.5 else None
+        )
+        for _ in range(query_count)
+    ]
+
+    def query(spec):
+        text, vector, filters = spec
+        searcher.hybrid_search(text, vector, filters=filters, top_k=10)
+        return 1
+
+    reports.append(measure("query", query, queries, concurrency))
+
+    print(f"Load test: {document_count:,} documents in batches of {batch_size}, "
+          f"{query_count:,} queries, concurrency {concurrency}")
+    print(f"{'operation':>10} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8} {'items/sec':>10}")
+    for report in reports:
+        print(f"{report.operation:>10} {report.requests:>9,} {report.errors:>7,} "
+              f"{report.p50_ms:>8.1f} {report.p99_ms:>8.1f} {report.throughput:>10,.0f}")
+    return reports
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Against a real (test) service: endpoint argument, key from AZURE_SEARCH_API_KEY
+        run_load_test(endpoint=sys.argv[1])
+    else:
+        from search_service_emulator import start_in_subprocess
+
+        process, endpoint = start_in_subprocess(latency=0.005, latency_jitter=0.01, error_rate=0.01, seed=1)
+        try:
+            run_load_test(endpoint=endpoint, credential="emulator-key", client_options={"retry_total": 0})
+        finally:
+            process.terminate()
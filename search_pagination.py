@@ -0,0 +1,49 @@
+# Keyset Pagination
+# Resumable cursors for streaming every matching chunk sorted by communication_date, id
+
+import base64
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from search_filters import normalize_datetime, odata_literal
+
+KEYSET_ORDER_BY = ["communication_date asc", "id asc"]
+KEYSET_FIELDS = ["communication_date", "id"]
+MAX_PAGE_SIZE = 1000  # Largest `top` the search service returns in one response
+
+
+class ResultPage(NamedTuple):
+    """One page of results and the cursor that resumes after it"""
+    documents: List[Dict[str, Any]]
+    cursor: Optional[str]
+
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past a document in keyset order"""
+    position = {field: document.get(field) for field in KEYSET_FIELDS}
+    if position["communication_date"] is not None:
+        position["communication_date"] = normalize_datetime(position["communication_date"]).isoformat()
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+
+def keyset_filter(cursor: str) -> str:
+    """Filter selecting documents after the cursor position
+
+    Null dates sort first in ascending order, so a cursor on a null date
+    continues through the remaining nulls and then every dated document.
+    """
+    position = decode_cursor(cursor)
+    last_id = odata_literal(position["id"])
+
+    if position["communication_date"] is None:
+        return f"((communication_date eq null and id gt {last_id}) or communication_date ne null)"
+
+    last_date = odata_literal(normalize_datetime(position["communication_date"]))
+    return (
+        f"(communication_date gt {last_date} or "
+        f"(communication_date eq {last_date} and id gt {last_id}))"
+    )
@@ -0,0 +1,644 @@
+# Local Search Service Emulator
+# HTTP stand-in for the subset of the Azure AI Search REST API used by the RAG stack
+
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from search_filters import normalize_datetime
+
+INDEX_PATH = re.compile(r"^/indexes(?:\('(?P<q>[^']+)'\)|/(?P<p>[^/?('\"]+))?(?P<rest>/[^?]*)?(?:\?.*)?$")
+DOC_PATH = re.compile(r"^/docs(?:\('(?P<q>[^']+)'\)|/(?P<p>[^/$]+))$")
+
+DEFAULT_TOP = 50  # Service default when a search request sets no top
+RRF_K = 60  # Reciprocal rank fusion constant, as used by Azure AI Search
+QUERY_OPERATORS = {"OR", "AND", "NOT"}
+WORD_PATTERN = re.compile(r"\w+")
+
+STRING_TYPES = ("Edm.String", "Collection(Edm.String)")
+DATETIME_TYPES = ("Edm.DateTimeOffset", "Collection(Edm.DateTimeOffset)")
+
+
+class EmulatorError(Exception):
+    """Maps to an error response with the given HTTP status"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+# ---------------------------------------------------------------------------
+# OData $filter subset: and/or/not, comparisons, search.in and any/all lambdas
+# ---------------------------------------------------------------------------
+
+FILTER_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<datetime>\d{4}-\d{2}-\d{2}T[\d:.]+(?:Z|[+-]\d{2}:\d{2}))
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_][\w.]*(?:/(?:any|all))?)
+      | (?P<punct>[(),:])
+    )""", re.VERBOSE)
+
+COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "ne": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and b is not None and a > b,
+    "ge": lambda a, b: a is not None and b is not None and a >= b,
+    "lt": lambda a, b: a is not None and b is not None and a < b,
+    "le": lambda a, b: a is not None and b is not None and a <= b
+}
+LITERAL_NAMES = {"null": None, "true": True, "false": False}
+
+Predicate = Callable[[Dict[str, Any], Dict[str, Any]], bool]
+
+
+def _tokenize_filter(expression: str) -> List[Tuple[str, Any]]:
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = FILTER_TOKEN.match(expression, position)
+        if not match:
+            raise EmulatorError(400, "InvalidRequestParameter", f"Invalid $filter near: {expression[position:]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "string":
+            tokens.append(("literal", text[1:-1].replace("''", "'")))
+        elif kind == "datetime":
+            tokens.append(("literal", normalize_datetime(text)))
+        elif kind == "number":
+            tokens.append(("literal", float(text) if any(c in text for c in ".eE") else int(text)))
+        else:
+            tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _FilterParser:
+    """Recursive-descent parser compiling a $filter into a predicate(doc, variables)"""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize_filter(expression)
+        self.position = 0
+
+    def _peek(self) -> Tuple[Optional[str], Any]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _next(self) -> Tuple[Optional[str], Any]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _expect(self, value: str):
+        kind, text = self._next()
+        if text != value:
+            raise EmulatorError(400, "InvalidRequestParameter", f"Expected '{value}' in $filter, got {text!r}")
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self.position != len(self.tokens):
+            raise EmulatorError(400, "InvalidRequestParameter", f"Unexpected {self._peek()[1]!r} in $filter")
+        return predicate
+
+    def _or(self) -> Predicate:
+        parts = [self._and()]
+        while self._peek() == ("name", "or"):
+            self._next()
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else (lambda doc, env: any(part(doc, env) for part in parts))
+
+    def _and(self) -> Predicate:
+        parts = [self._unary()]
+        while self._peek() == ("name", "and"):
+            self._next()
+            parts.append(self._unary())
+        return parts[0] if len(parts) == 1 else (lambda doc, env: all(part(doc, env) for part in parts))
+
+    def _unary(self) -> Predicate:
+        if self._peek() == ("name", "not"):
+            self._next()
+            inner = self._unary()
+            return lambda doc, env: not inner(doc, env)
+        return self._primary()
+
+    def _primary(self) -> Predicate:
+        kind, text = self._peek()
+        if text == "(":
+            self._next()
+            inner = self._or()
+            self._expect(")")
+            return inner
+        if text == "search.in":
+            return self._search_in()
+        if kind == "name" and text.endswith(("/any", "/all")):
+            return self._lambda()
+        if kind == "name" and text in ("true", "false") and self._operator_follows() is None:
+            self._next()
+            return (lambda doc, env: True) if text == "true" else (lambda doc, env: False)
+
+        left = self._operand()
+        operator = self._peek()[1]
+        if operator not in COMPARISONS:
+            raise EmulatorError(400, "InvalidRequestParameter", f"Expected a comparison after {text!r}")
+        self._next()
+        right = self._operand()
+        compare = COMPARISONS[operator]
+        return lambda doc, env: compare(left(doc, env), right(doc, env))
+
+    def _operator_follows(self) -> Optional[str]:
+        if self.position + 1 < len(self.tokens):
+            kind, text = self.tokens[self.position + 1]
+            if kind == "name" and text in COMPARISONS:
+                return text
+        return None
+
+    def _operand(self) -> Callable[[Dict[str, Any], Dict[str, Any]], Any]:
+        kind, value = self._next()
+        if kind == "literal":
+            return lambda doc, env: value
+        if kind == "name" and value in LITERAL_NAMES:
+            literal = LITERAL_NAMES[value]
+            return lambda doc, env: literal
+        if kind == "name":
+            return lambda doc, env: env[value] if value in env else doc.get(value)
+        raise EmulatorError(400, "InvalidRequestParameter", f"Unexpected {value!r} in $filter")
+
+    def _search_in(self) -> Predicate:
+        self._next()
+        self._expect("(")
+        variable = self._operand()
+        self._expect(",")
+        kind, values = self._next()
+        delimiters = " ,"
+        if self._peek()[1] == ",":
+            self._next()
+            delimiters = self._next()[1]
+        self._expect(")")
+        if kind != "literal" or not isinstance(values, str):
+            raise EmulatorError(400, "InvalidRequestParameter", "search.in expects a string list of values")
+        allowed = {value for value in re.split("[" + re.escape(delimiters) + "]", values) if value}
+        return lambda doc, env: variable(doc, env) in allowed
+
+    def _lambda(self) -> Predicate:
+        field, quantifier = self._next()[1].split("/")
+        self._expect("(")
+        if self._peek()[1] == ")":  # tags/any() is true for a non-empty collection
+            self._next()
+            return lambda doc, env: bool(doc.get(field))
+        variable = self._next()[1]
+        self._expect(":")
+        body = self._or()
+        self._expect(")")
+        check = any if quantifier == "any" else all
+
+        def predicate(doc, env):
+            values = env[field] if field in env else doc.get(field)
+            return check(body(doc, {**env, variable: value}) for value in values or ())
+        return predicate
+
+
+@lru_cache(maxsize=1024)
+def compile_odata_filter(expression: str) -> Predicate:
+    """Compile an OData $filter expression into predicate(doc, variables)"""
+    return _FilterParser(expression).parse()
+
+
+# ---------------------------------------------------------------------------
+# Index storage and query execution
+# ---------------------------------------------------------------------------
+
+def _split_list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
+
+
+def _terms(text: str) -> List[str]:
+    return [word.lower() for word in WORD_PATTERN.findall(text) if word not in QUERY_OPERATORS]
+
+
+def _sort_value(value) -> Tuple:
+    return (False, 0) if value is None else (True, value)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class _IndexStore:
+    """Documents of one emulated index plus the definition they were created with"""
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.definition = definition
+        fields = definition.get("fields") or []
+        self.key = next((field["name"] for field in fields if field.get("key")), "id")
+        self.datetime_fields = [field["name"] for field in fields if field.get("type") in DATETIME_TYPES]
+        self.searchable_fields = [
+            field["name"] for field in fields
+            if field.get("type") in STRING_TYPES and field.get("searchable", True)
+        ]
+        self.hidden_fields = {field["name"] for field in fields if field.get("retrievable") is False}
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()
+        self._vectors = {}  # field -> (version, keys, matrix)
+        self._terms = {}  # (key, fields) -> (term counts, length), cleared on writes
+        self._version = 0
+
+    def _normalize(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        for name in self.datetime_fields:
+            value = document.get(name)
+            if isinstance(value, str):
+                document[name] = normalize_datetime(value)
+            elif isinstance(value, list):
+                document[name] = [normalize_datetime(item) for item in value]
+        return document
+
+    def apply(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run upload / merge / mergeOrUpload / delete actions, returning per-document results"""
+        results = []
+        with self.lock:
+            for action in actions:
+                action = dict(action)
+                kind = action.pop("@search.action", "upload")
+                key = action.get(self.key)
+                status, message = 200, None
+                if key is None:
+                    status, message = 400, f"Document is missing key field '{self.key}'"
+                elif kind == "upload":
+                    status = 200 if key in self.documents else 201
+                    self.documents[key] = self._normalize(action)
+                elif kind in ("merge", "mergeOrUpload"):
+                    if key in self.documents:
+                        self.documents[key].update(self._normalize(action))
+                    elif kind == "mergeOrUpload":
+                        status = 201
+                        self.documents[key] = self._normalize(action)
+                    else:
+                        status, message = 404, f"Document not found: {key}"
+                elif kind == "delete":
+                    self.documents.pop(key, None)
+                else:
+                    status, message = 400, f"Unknown @search.action '{kind}'"
+                results.append({
+                    "key": key,
+                    "status": status < 300,
+                    "errorMessage": message,
+                    "statusCode": status
+                })
+            self._version += 1
+            self._terms.clear()
+        return results
+
+    def _vector_matrix(self, field: str):
+        """Normalized matrix of one vector field, rebuilt only after writes"""
+        import numpy as np
+
+        with self.lock:
+            cached = self._vectors.get(field)
+            if cached and cached[0] == self._version:
+                return cached[1], cached[2]
+            keys = [key for key, doc in self.documents.items() if doc.get(field)]
+            matrix = np.array([self.documents[key][field] for key in keys], dtype=np.float32)
+            if len(keys):
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix /= np.where(norms == 0, 1, norms)
+            self._vectors[field] = (self._version, keys, matrix)
+            return keys, matrix
+
+    def _doc_terms(self, key: str, fields: Tuple[str, ...]) -> Tuple[Dict[str, int], int]:
+        cached = self._terms.get((key, fields))
+        if cached is None:
+            doc = self.documents[key]
+            words = []
+            for field in fields:
+                value = doc.get(field)
+                if isinstance(value, list):
+                    value = " ".join(str(item) for item in value)
+                if value:
+                    words.extend(_terms(str(value)))
+            counts: Dict[str, int] = {}
+            for word in words:
+                counts[word] = counts.get(word, 0) + 1
+            cached = self._terms[(key, fields)] = (counts, len(words))
+        return cached
+
+    def _text_scores(self, search: str, fields: Tuple[str, ...], candidates: List[str]) -> Dict[str, float]:
+        """Term-frequency score normalized by field length (a stand-in for BM25)"""
+        terms = _terms(search)
+        scores = {}
+        for key in candidates:
+            counts, length = self._doc_terms(key, fields)
+            matched = sum(counts.get(term, 0) for term in terms)
+            if matched:
+                scores[key] = matched / (length ** 0.5)
+        return scores
+
+    def _vector_scores(self, query: Dict[str, Any], allowed: set) -> List[Tuple[str, float]]:
+        import numpy as np
+
+        if query.get("kind") != "vector" or "vector" not in query:
+            raise EmulatorError(400, "InvalidRequestParameter", f"Unsupported vector query kind '{query.get('kind')}'")
+        k = query.get("k") or DEFAULT_TOP
+        ranked = []
+        for field in _split_list(query.get("fields")):
+            keys, matrix = self._vector_matrix(field)
+            if not keys:
+                continue
+            vector = np.asarray(query["vector"], dtype=np.float32)
+            if vector.shape[0] != matrix.shape[1]:
+                raise EmulatorError(
+                    400, "InvalidRequestParameter",
+                    f"Vector for '{field}' has {vector.shape[0]} dimensions, expected {matrix.shape[1]}"
+                )
+            vector /= np.linalg.norm(vector) or 1.0
+            similarities = matrix @ vector
+            found = 0
+            for row in np.argsort(-similarities):  # Exhaustive k-NN with pre-filtering
+                if keys[row] in allowed:
+                    ranked.append((keys[row], 1.0 / (2.0 - float(similarities[row]))))  # 1 / (1 + cosine distance)
+                    found += 1
+                    if found == k:
+                        break
+        ranked.sort(key=lambda item: -item[1])
+        return ranked[:k]
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter, score (text, vector or RRF hybrid), order and project documents"""
+        predicate = compile_odata_filter(body["filter"]) if body.get("filter") else None
+        with self.lock:
+            candidates = [key for key, doc in self.documents.items() if predicate is None or predicate(doc, {})]
+
+            search = (body.get("search") or "").strip()
+            vector_queries = body.get("vectorQueries") or []
+            rankings = []
+            if search and search != "*":
+                fields = tuple(_split_list(body.get("searchFields")) or self.searchable_fields)
+                text_scores = self._text_scores(search, fields, candidates)
+                rankings.append(sorted(text_scores.items(), key=lambda item: -item[1]))
+            allowed = set(candidates)
+            for query in vector_queries:
+                rankings.append(self._vector_scores(query, allowed))
+
+            if not rankings:
+                scored = [(key, 1.0) for key in candidates]
+            elif len(rankings) == 1:
+                scored = rankings[0]
+            else:
+                fused: Dict[str, float] = {}
+                for ranking in rankings:
+                    for rank, (key, _) in enumerate(ranking):
+                        fused[key] = fused.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+                scored = sorted(fused.items(), key=lambda item: -item[1])
+
+            for clause in reversed(_split_list(body.get("orderby"))):
+                field, _, direction = clause.partition(" ")
+                descending = direction.strip().lower() == "desc"
+                if field == "search.score()":
+                    scored.sort(key=lambda item: item[1], reverse=descending)
+                else:
+                    # Nulls sort first ascending and last descending, as in the service
+                    scored.sort(key=lambda item: _sort_value(self.documents[item[0]].get(field)), reverse=descending)
+
+            total = len(scored)
+            skip = body.get("skip") or 0
+            top = body.get("top") if body.get("top") is not None else DEFAULT_TOP
+            select = _split_list(body.get("select"))
+            hits = [self.project(key, select, score) for key, score in scored[skip:skip + top]]
+
+        response = {"value": hits}
+        if body.get("count"):
+            response["@odata.count"] = total
+        return response
+
+    def project(self, key: str, select: List[str], score: float = None) -> Dict[str, Any]:
+        doc = self.documents[key]
+        if select and select != ["*"]:
+            hit = {field: doc.get(field) for field in select if field not in self.hidden_fields}
+        else:
+            hit = {field: value for field, value in doc.items() if field not in self.hidden_fields}
+        if score is not None:
+            hit["@search.score"] = score
+        return hit
+
+
+class _SearchRequestHandler(BaseHTTPRequestHandler):
+    """Routes REST calls from the search SDK to the owning emulator"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        emulator = self.server.emulator
+        try:
+            emulator.inject_faults()
+            body = json.loads(raw) if raw else {}
+            status, payload = emulator.handle(method, self.path, body)
+        except EmulatorError as e:
+            status, payload = e.status, {"error": {"code": e.code, "message": str(e)}}
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload = 400, {"error": {"code": "InvalidRequestParameter", "message": str(e)}}
+        self._send(status, payload)
+
+    def _send(self, status: int, payload):
+        if payload is None:
+            data, content_type = b"", "application/json"
+        elif isinstance(payload, str):
+            data, content_type = payload.encode(), "text/plain"
+        else:
+            data = json.dumps(payload, default=_json_default).encode()
+            content_type = "application/json; odata.metadata=none"
+        self.send_response(status)
+        if status in (429, 503):
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class SearchServiceEmulator:
+    """In-process emulator of index create, document upload/merge and search
+
+    latency: seconds added to every request, plus up to latency_jitter more
+    error_rate: fraction of requests answered with error_status instead
+    seed: makes jitter and injected errors reproducible
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.indexes: Dict[str, _IndexStore] = {}
+        self.request_count = 0
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _SearchRequestHandler)
+        self._server.daemon_threads = True
+        self._server.emulator = self
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def inject_faults(self):
+        """Apply configured latency and raise an injected error for a share of requests"""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+            fail = self.error_rate and self._random.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise EmulatorError(self.error_status, "InjectedFault", "Error injected by SearchServiceEmulator")
+
+    def create_index(self, definition: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or replace an index definition, keeping documents of an existing index"""
+        name = definition["name"]
+        store = _IndexStore(definition)
+        with self._lock:
+            previous = self.indexes.get(name)
+            if previous is not None:
+                store.documents = previous.documents
+            self.indexes[name] = store
+        return definition
+
+    def seed(self, index_name: str, documents: List[Dict[str, Any]], key: str = "id"):
+        """Load documents directly, creating a minimal index definition if needed"""
+        if index_name not in self.indexes:
+            self.create_index({"name": index_name, "fields": [{"name": key, "type": "Edm.String", "key": True}]})
+        self.indexes[index_name].apply(documents)
+
+    def _index(self, name: str) -> _IndexStore:
+        store = self.indexes.get(name)
+        if store is None:
+            raise EmulatorError(404, "ResourceNotFound", f"No index with the name '{name}' was found")
+        return store
+
+    def handle(self, method: str, path: str, body: Dict[str, Any]):
+        """Execute one REST call, returning (status, payload)"""
+        match = INDEX_PATH.match(path)
+        if not match:
+            raise EmulatorError(404, "ResourceNotFound", f"Unsupported path {path}")
+        name = unquote(match.group("q") or match.group("p") or "")
+        rest = match.group("rest") or ""
+
+        if not rest:
+            if method == "GET" and not name:
+                with self._lock:
+                    return 200, {"value": [store.definition for store in self.indexes.values()]}
+            if method == "POST" and not name:
+                return 201, self.create_index(body)
+            if method == "PUT" and name:
+                existed = name in self.indexes
+                return (200 if existed else 201), self.create_index(dict(body, name=name))
+            if method == "GET" and name:
+                return 200, self._index(name).definition
+            if method == "DELETE" and name:
+                self._index(name)
+                with self._lock:
+                    del self.indexes[name]
+                return 204, None
+        elif rest == "/docs/search.index" and method == "POST":
+            results = self._index(name).apply(body.get("value") or [])
+            return (200 if all(result["status"] for result in results) else 207), {"value": results}
+        elif rest == "/docs/search.post.search" and method == "POST":
+            return 200, self._index(name).search(body)
+        elif rest == "/docs/$count" and method == "GET":
+            return 200, str(len(self._index(name).documents))
+        elif method == "GET" and DOC_PATH.match(rest):
+            doc_match = DOC_PATH.match(rest)
+            key = unquote(doc_match.group("q") or doc_match.group("p"))
+            store = self._index(name)
+            if key not in store.documents:
+                raise EmulatorError(404, "ResourceNotFound", f"Document not found: {key}")
+            select = re.search(r"[?&]\$select=([^&]*)", path)
+            return 200, store.project(key, _split_list(unquote(select.group(1))) if select else [])
+
+        raise EmulatorError(404, "ResourceNotFound", f"Unsupported {method} {path}")
+
+    def start(self) -> "SearchServiceEmulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _serve_forever(options: Dict[str, Any], endpoints):
+    emulator = SearchServiceEmulator(**options).start()
+    endpoints.put(emulator.endpoint)
+    emulator._thread.join()
+
+
+def start_in_subprocess(**options) -> Tuple[multiprocessing.Process, str]:
+    """Run an emulator in its own process so it does not share the GIL with a load generator
+
+    Returns (process, endpoint); call process.terminate() when done.
+    """
+    endpoints = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_forever, args=(options, endpoints), daemon=True)
+    process.start()
+    return process, endpoints.get(timeout=30)
+
+
+if __name__ == "__main__":
+    import sys
+
+    emulator = SearchServiceEmulator(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8080).start()
+    print(f"Search service emulator listening on {emulator.endpoint} (Ctrl+C to stop)")
+    try:
+        emulator._thread.join()
+    except KeyboardInterrupt:
+        emulator.stop()
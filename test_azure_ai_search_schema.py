@@ -0,0 +1,37 @@
+# Search Schema Tests
+# Index definitions built offline; no search service is contacted
+
+from azure_ai_search_schema import PainPointSearchIndexManager
+from vector_compression import VectorCompressionConfig
+
+
+def build_schema(vector_config: VectorCompressionConfig):
+    manager = PainPointSearchIndexManager(
+        endpoint="https://example.search.windows.net",
+        credential="test-key",
+        vector_config=vector_config
+    )
+    return manager.create_index_schema()
+
+
+def rescoring(index):
+    (compression,) = index.vector_search.compressions
+    return compression.rescoring_options
+
+
+def test_rescoring_keeps_original_vectors():
+    options = rescoring(build_schema(VectorCompressionConfig(compression="scalar", rescore=True)))
+    assert options.enable_rescoring
+    assert options.rescore_storage_method == "preserveOriginals"
+
+
+def test_no_rescoring_discards_original_vectors():
+    for compression in ("scalar", "binary"):
+        options = rescoring(build_schema(VectorCompressionConfig(compression=compression, rescore=False)))
+        assert not options.enable_rescoring
+        assert options.default_oversampling is None
+        assert options.rescore_storage_method == "discardOriginals"
+
+
+def test_uncompressed_index_has_no_compressions():
+    assert not build_schema(VectorCompressionConfig()).vector_search.compressions
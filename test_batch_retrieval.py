@@ -0,0 +1,97 @@
+# Batched Retrieval Tests
+# run_batch against a fake search function: dedup, concurrency bound, rate limiting and error reporting
+
+import threading
+import time
+
+from batch_retrieval import RateLimiter, SearchSpec, run_batch
+
+
+class FakeSearch:
+    """Records calls and the peak number of calls running at once"""
+
+    def __init__(self, delay: float = 0.0, fail_on: str = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query, query_vector, filters=None, top_k=20):
+        with self._lock:
+            self.calls.append((query, filters, top_k))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if query == self.fail_on:
+                raise RuntimeError(f"search failed for {query}")
+            return [{"id": f"{query}-{top_k}"}]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def collect(search, specs, **options):
+    return list(run_batch(search, specs, progress=None, **options))
+
+
+def test_identical_specs_run_once_and_report_every_position():
+    search = FakeSearch()
+    specs = [
+        SearchSpec("Billing  Issue", [0.1, 0.2], {"customer_tier": "enterprise"}),
+        SearchSpec("login", [0.3]),
+        SearchSpec("billing issue", [0.1, 0.2], {"customer_tier": "enterprise"}),
+        ("login", [0.3]),
+    ]
+    results = collect(search, specs)
+
+    assert len(search.calls) == 2
+    assert sorted(sorted(result.spec_indexes) for result in results) == [[0, 2], [1, 3]]
+    assert all(result.error is None and result.results for result in results)
+
+
+def test_concurrency_is_bounded():
+    search = FakeSearch(delay=0.02)
+    collect(search, [SearchSpec(f"query {i}", [float(i)]) for i in range(24)], max_concurrency=3)
+
+    assert len(search.calls) == 24
+    assert search.peak <= 3
+
+
+def test_requests_are_rate_limited():
+    search = FakeSearch()
+    start = time.perf_counter()
+    collect(search, [SearchSpec(f"query {i}", [float(i)]) for i in range(12)],
+            max_concurrency=2, requests_per_second=40)
+    elapsed = time.perf_counter() - start
+
+    # A burst of max_concurrency, then one call per 1/40 s
+    assert elapsed >= (12 - 2) / 40 * 0.9
+
+
+def test_rate_limiter_allows_burst_then_throttles():
+    limiter = RateLimiter(rate=50, burst=5)
+    start = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.perf_counter() - start < 0.05
+    for _ in range(5):
+        limiter.acquire()
+    assert time.perf_counter() - start >= 5 / 50 * 0.9
+
+
+def test_errors_are_reported_per_spec():
+    search = FakeSearch(fail_on="broken")
+    specs = [
+        SearchSpec("ok", [0.1]),
+        SearchSpec("bad filter", [0.1], {"not_a_field": 1}),
+        SearchSpec("broken", [0.2]),
+    ]
+    results = {result.spec_indexes[0]: result for result in collect(search, specs)}
+
+    assert results[0].error is None and results[0].results == [{"id": "ok-20"}]
+    assert isinstance(results[1].error, ValueError) and results[1].results is None
+    assert isinstance(results[2].error, RuntimeError) and results[2].results is None
+    assert [call[0] for call in search.calls if call[0] == "bad filter"] == []
@@ -0,0 +1,73 @@
+# Customer Resolution Tests
+# Known IDs win, only normalized-name matches rewrite, and shared words never merge customers
+
+from customer_resolution import CustomerResolver, ResolvingDocumentBuilder
+
+KNOWN_CUSTOMERS = {
+    "CUST-1": "Acme Corporation",
+    "CUST-2": "Bank of America",
+    "CUST-3": "Delta Air Lines",
+}
+
+
+def make_resolver() -> CustomerResolver:
+    return CustomerResolver.from_customers(KNOWN_CUSTOMERS)
+
+
+def test_normalized_name_variant_resolves_to_canonical_customer():
+    resolver = make_resolver()
+    assert resolver.resolve("ACME Corp.") == ("CUST-1", "Acme Corporation")
+    assert resolver.resolve("acme", "CRM-77") == ("CUST-1", "Acme Corporation")
+
+
+def test_known_customer_id_wins_over_name():
+    resolver = make_resolver()
+    assert resolver.resolve("Acme Corporation", "CUST-2") == ("CUST-2", "Bank of America")
+    assert resolver.resolve(None, "CUST-3") == ("CUST-3", "Delta Air Lines")
+
+
+def test_shared_word_does_not_replace_supplied_id():
+    resolver = make_resolver()
+    assert resolver.resolve("Silicon Valley Bank", "CUST-9") == ("CUST-9", "Silicon Valley Bank")
+    assert resolver.resolve("Delta Dental", "CUST-10") == ("CUST-10", "Delta Dental")
+
+
+def test_fuzzy_matches_do_not_spread_through_the_matcher():
+    resolver = make_resolver()
+    resolver.resolve("Silicon Valley Bank", "CUST-9")
+    assert resolver.resolve("Valley Farms", "CUST-11") == ("CUST-11", "Valley Farms")
+    assert resolver.resolve("Bank of America") == ("CUST-2", "Bank of America")
+
+
+def test_unmatched_name_without_id_becomes_new_customer():
+    resolver = make_resolver()
+    customer_id, name = resolver.resolve("Delta Dental")
+    assert name == "Delta Dental"
+    assert customer_id not in KNOWN_CUSTOMERS
+    assert resolver.resolve("Delta Dental Inc") == (customer_id, "Delta Dental")
+
+
+def test_same_name_resolves_per_customer_id():
+    resolver = make_resolver()
+    assert resolver.resolve("Acme Corporation", "CUST-1") == ("CUST-1", "Acme Corporation")
+    assert resolver.resolve("Acme Corporation", "CUST-2") == ("CUST-2", "Bank of America")
+    assert resolver.resolve("Acme Corporation", "CUST-1") == ("CUST-1", "Acme Corporation")
+
+
+def test_call_rewrites_parent_in_place():
+    resolver = make_resolver()
+    parent = {"customer_id": None, "customer_name": "Bank of America, Inc."}
+    resolver(parent)
+    assert parent == {"customer_id": "CUST-2", "customer_name": "Bank of America"}
+    assert resolver.stats["rewritten"] == 1
+
+
+def test_resolving_builder_rewrites_every_chunk():
+    builder = ResolvingDocumentBuilder(make_resolver())
+    documents = list(builder.iter_batch([
+        ("DOC-1", {"customer_name": "ACME Corp."}, [(0, "first", [0.0]), (1, "second", [0.0])]),
+        ("DOC-2", {"customer_name": "Delta Dental", "customer_id": "CUST-10"}, [(0, "third", [0.0])]),
+    ]))
+    assert [(doc["customer_id"], doc["customer_name"]) for doc in documents] == [
+        ("CUST-1", "Acme Corporation"), ("CUST-1", "Acme Corporation"), ("CUST-10", "Delta Dental")
+    ]
@@ -0,0 +1,28 @@
+# Document Chunker Tests
+# Whitespace-only input yields nothing and whitespace-free streams stay bounded
+
+from document_chunker import RegexTokenizer, _split_at_word_boundary, chunk_text_stream
+
+
+def test_whitespace_only_input_yields_no_chunks():
+    assert list(chunk_text_stream("  \n\t  ", tokenizer=RegexTokenizer())) == []
+    assert list(chunk_text_stream(["  ", "\n\n", " "], tokenizer=RegexTokenizer())) == []
+
+
+def test_chunks_follow_word_boundaries():
+    chunks = list(chunk_text_stream(["alpha be", "ta gamma ", "delta"], chunk_size=2, overlap=1,
+                                    tokenizer=RegexTokenizer()))
+    assert [chunk.text for chunk in chunks] == ["alpha beta", "beta gamma", "gamma delta"]
+    assert [chunk.overlap_with_next for chunk in chunks] == [1, 1, 0]
+
+
+def test_carry_without_whitespace_is_capped():
+    pieces = ["x" * 30 for _ in range(10)]
+    split = list(_split_at_word_boundary(pieces, max_carry=100))
+    assert "".join(split) == "x" * 300
+    assert max(len(piece) for piece in split) <= 130
+
+
+def test_split_keeps_words_whole_below_the_cap():
+    split = list(_split_at_word_boundary(["one tw", "o three"], max_carry=100))
+    assert split == ["one ", "two ", "three"]
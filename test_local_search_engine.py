@@ -0,0 +1,60 @@
+# Local Search Engine Tests
+# Signature parity with PainPointRAGSearcher and exact BM25 statistics after replacement
+
+import inspect
+
+from azure_ai_search_schema import PainPointRAGSearcher
+from local_search_engine import LocalPainPointSearcher
+
+
+def make_doc(doc_id: str, content: str, vector, **fields):
+    return {"id": doc_id, "content": content, "content_vector": vector, "customer_tier": "enterprise", **fields}
+
+
+def make_searcher() -> LocalPainPointSearcher:
+    searcher = LocalPainPointSearcher(dimensions=4)
+    searcher.index_documents([
+        make_doc("a", "billing refund delayed", [1, 0, 0, 0], parent_document_id="P1"),
+        make_doc("b", "login timeout error", [0, 1, 0, 0], parent_document_id="P2"),
+        make_doc("c", "dashboard export broken", [0, 0, 1, 0], parent_document_id="P3"),
+    ])
+    return searcher
+
+
+def test_signatures_match_the_azure_searcher():
+    for name in ("hybrid_search", "search_by_pain_point_pattern"):
+        expected = list(inspect.signature(getattr(PainPointRAGSearcher, name)).parameters)
+        assert list(inspect.signature(getattr(LocalPainPointSearcher, name)).parameters) == expected
+
+
+def test_profile_and_lazy_hits():
+    searcher = make_searcher()
+    hits = searcher.hybrid_search("billing", [1, 0, 0, 0], top_k=1, profile="ids")
+    assert set(hits[0]) == {"id", "parent_document_id", "chunk_index", "@search.score"}
+
+    lazy = searcher.hybrid_search("billing", [1, 0, 0, 0], top_k=1, profile="ids", lazy=True)
+    assert lazy[0]["id"] == "a"
+    assert lazy[0]["content"] == "billing refund delayed"
+
+
+def test_pattern_search_honours_top():
+    searcher = make_searcher()
+    assert len(searcher.search_by_pain_point_pattern(["billing", "login", "export"], top=2)) == 2
+
+
+def test_replaced_documents_leave_bm25_statistics():
+    searcher = make_searcher()
+    searcher.index_documents([make_doc("a", "billing refund delayed again", [1, 0, 0, 0])])
+    fresh = LocalPainPointSearcher(dimensions=4)
+    fresh.index_documents([
+        make_doc("b", "login timeout error", [0, 1, 0, 0]),
+        make_doc("c", "dashboard export broken", [0, 0, 1, 0]),
+        make_doc("a", "billing refund delayed again", [1, 0, 0, 0]),
+    ])
+
+    replaced = dict(searcher.text_index.search(["billing", "error"], 10))
+    expected = dict(fresh.text_index.search(["billing", "error"], 10))
+    by_id = lambda scores, engine: {engine.documents[row]["id"]: score for row, score in scores.items()}
+    assert by_id(replaced, searcher) == by_id(expected, fresh)
+    assert [hit["id"] for hit in searcher.search_by_pain_point_pattern(["delayed"])] == ["a"]
+    assert searcher.text_index.total_length == fresh.text_index.total_length
@@ -0,0 +1,45 @@
+# Partition Compaction Tests
+# compact_partitions against the local search service emulator
+
+from datetime import datetime, timezone
+
+from azure_ai_search_schema import PainPointRAGSearcher, PainPointSearchIndexManager
+from search_cache import SearchResultCache
+from search_service_emulator import SearchServiceEmulator
+from vector_compression import VectorCompressionConfig
+
+
+def make_document(month: int):
+    return {
+        "id": f"D{month}",
+        "parent_document_id": f"P{month}",
+        "chunk_index": 0,
+        "content": f"billing issue {month}",
+        "content_vector": [1.0, 0.0, 0.0, 0.0],
+        "customer_id": "C1",
+        "communication_date": datetime(2024, month, 5, tzinfo=timezone.utc)
+    }
+
+
+def test_cached_hits_do_not_point_at_compacted_partitions():
+    with SearchServiceEmulator() as emulator:
+        options = dict(
+            endpoint=emulator.endpoint,
+            credential="test-key",
+            index_name="pp",
+            vector_config=VectorCompressionConfig(dimensions=4, store_original_vector=True),
+            cache=SearchResultCache(),
+            partitioned=True
+        )
+        manager = PainPointSearchIndexManager(**options)
+        manager.index_documents([make_document(month) for month in (1, 2, 3)])
+        searcher = PainPointRAGSearcher(partition_refresh=0, **options)
+        searcher.hybrid_search("billing", [1.0, 0.0, 0.0, 0.0], top_k=5, profile="ids")
+
+        assert manager.compact_partitions(datetime(2024, 3, 1, tzinfo=timezone.utc)) == {"pp-202401": 1, "pp-202402": 1}
+
+        hits = searcher.hybrid_search("billing", [1.0, 0.0, 0.0, 0.0], top_k=5, profile="ids", lazy=True)
+        assert sorted((hit["id"], hit["@search.partition"]) for hit in hits) == [
+            ("D1", "pp-cold"), ("D2", "pp-cold"), ("D3", "pp-202403")
+        ]
+        assert sorted(hit["content"] for hit in hits) == ["billing issue 1", "billing issue 2", "billing issue 3"]
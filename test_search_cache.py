@@ -0,0 +1,32 @@
+# Search Result Cache Tests
+# Customer- and index-scoped invalidation of cached results
+
+from search_cache import SearchResultCache
+
+
+def cached_key(cache: SearchResultCache, filters=None, index_name="pp") -> str:
+    key = cache.make_key("billing issue", [0.1, 0.2], filters, 10, ["id"], index_name=index_name)
+    cache.set(key, [{"id": "a"}])
+    return key
+
+
+def test_customer_invalidation_expires_scoped_and_unscoped_results():
+    cache = SearchResultCache()
+    scoped, other, unscoped = cached_key(cache, {"customer_id": "C1"}), cached_key(cache, {"customer_id": "C2"}), cached_key(cache)
+    cache.invalidate_customers(["C1"])
+
+    assert cache.make_key("billing issue", [0.1, 0.2], {"customer_id": "C1"}, 10, ["id"], index_name="pp") != scoped
+    assert cache.make_key("billing issue", [0.1, 0.2], {"customer_id": "C2"}, 10, ["id"], index_name="pp") == other
+    assert cache.make_key("billing issue", [0.1, 0.2], None, 10, ["id"], index_name="pp") != unscoped
+
+
+def test_index_invalidation_expires_every_result_of_that_index_only():
+    cache = SearchResultCache()
+    scoped, unscoped, elsewhere = cached_key(cache, {"customer_id": "C1"}), cached_key(cache), cached_key(cache, index_name="other")
+    cache.invalidate_index("pp")
+
+    assert cache.make_key("billing issue", [0.1, 0.2], {"customer_id": "C1"}, 10, ["id"], index_name="pp") != scoped
+    assert cache.make_key("billing issue", [0.1, 0.2], None, 10, ["id"], index_name="pp") != unscoped
+    assert cache.get(cache.make_key("billing issue", [0.1, 0.2], None, 10, ["id"], index_name="other")) == [{"id": "a"}]
+    assert cache.make_key("billing issue", [0.1, 0.2], None, 10, ["id"], index_name="other") == elsewhere
+    assert cache.stats()["invalidations"] == 1
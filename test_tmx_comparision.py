@@ -0,0 +1,64 @@
+# TMX Analyzer Tests
+# One source language per file when cleaning, and the summary table against pandas
+
+import csv
+
+import pytest
+
+from tmx_comparision import TMXAnalyzer, _format_table
+
+MIXED_ORDER_TMX = """<?xml version="1.0" encoding="utf-8"?>
+<tmx version="1.4">
+  <header srclang="{srclang}" datatype="plaintext" segtype="sentence" adminlang="en" o-tmf="test" creationtool="test" creationtoolversion="1"/>
+  <body>
+    <tu tuid="1"><tuv xml:lang="en"><seg>Hello</seg></tuv><tuv xml:lang="de"><seg>Hallo</seg></tuv></tu>
+    <tu tuid="2"><tuv xml:lang="de"><seg>Welt</seg></tuv><tuv xml:lang="en"><seg>World</seg></tuv></tu>
+    <tu tuid="3"><tuv xml:lang="EN"><seg>Good</seg></tuv><tuv xml:lang="de"><seg>Gut</seg></tuv></tu>
+    <tu tuid="4"><tuv xml:lang="de"><seg>Nur</seg></tuv><tuv xml:lang="fr"><seg>Seul</seg></tuv></tu>
+  </body>
+</tmx>
+"""
+
+
+def clean(tmp_path, srclang, **options):
+    path = tmp_path / "memory.tmx"
+    path.write_text(MIXED_ORDER_TMX.format(srclang=srclang), encoding="utf-8")
+    output = tmp_path / "memory.tsv"
+    results = TMXAnalyzer([str(path)]).clean_and_export(str(path), str(output), **options)
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    return results, rows
+
+
+def test_all_srclang_uses_the_majority_language_for_every_unit(tmp_path):
+    results, rows = clean(tmp_path, "*all*")
+    assert results["source_language"] == "de"
+    assert {row["source_lang"] for row in rows} == {"de"}
+    assert [(row["tu_id"], row["source"], row["target"]) for row in rows] == [
+        ("1", "Hallo", "Hello"), ("2", "Welt", "World"), ("3", "Gut", "Good"), ("4", "Nur", "Seul")
+    ]
+
+
+def test_header_srclang_drops_units_without_it(tmp_path):
+    results, rows = clean(tmp_path, "en")
+    assert {row["source_lang"] for row in rows} == {"en"}
+    assert [row["tu_id"] for row in rows] == ["1", "2", "3"]
+    assert results["counts"]["dropped_empty"] == 2  # de and fr of unit 4
+
+
+def test_configured_source_lang_wins_over_header(tmp_path):
+    results, rows = clean(tmp_path, "en", source_lang="de")
+    assert results["source_language"] == "de"
+    assert len(rows) == 4
+
+
+def test_summary_table_matches_pandas():
+    pd = pytest.importorskip("pandas")
+    rows = [
+        {"File": "a.tmx", "Translation Units": 3, "Languages": 2, "Avg Empty Rate (%)": "0.0",
+         "Encoding": None, "Encoding Confidence": "0.00"},
+        {"File": "longer_name.tmx", "Translation Units": 12_345, "Languages": 14, "Avg Empty Rate (%)": "12.5",
+         "Encoding": "utf-8", "Encoding Confidence": "0.99"},
+    ]
+    for table in (rows, rows[:1], rows[1:]):
+        assert _format_table(table) == pd.DataFrame(table).to_string(index=False)
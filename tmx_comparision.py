@@ -1,12 +1,158 @@
 import xml.etree.ElementTree as ET
-import pandas as pd
-import numpy as np
 from collections import Counter, defaultdict
 import hashlib
-import chardet
 import re
+import csv
 from pathlib import Path
 
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+TRAINING_COLUMNS = ['tu_id', 'source_lang', 'target_lang', 'source', 'target']
+EXPORT_FORMATS = ('tmx', 'tsv', 'parquet')
+
+
+class RunningStats:
+    """
+    Welford running mean / standard deviation, for statistics gathered while streaming
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    @property
+    def std(self):
+        # Population deviation, matching np.std in analyze_length_ratios
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+
+class _TSVWriter:
+    def __init__(self, path, batch_size):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file, delimiter='\t')
+        self.writer.writerow(TRAINING_COLUMNS)
+    
+    def write(self, row):
+        self.writer.writerow(row)
+    
+    def close(self):
+        self.file.close()
+
+
+class _TMXWriter:
+    def __init__(self, path, batch_size):
+        from xml.sax.saxutils import escape, quoteattr  # Pulls in urllib; only TMX output needs it
+        
+        self.escape = escape
+        self.quoteattr = quoteattr
+        self.file = open(path, 'w', encoding='utf-8')
+        self.started = False
+    
+    def _start(self, source_lang):
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4">\n')
+        self.file.write(
+            f'  <header creationtool="TMXAnalyzer" creationtoolversion="1.0" segtype="sentence" '
+            f'o-tmf="TMXAnalyzer" adminlang="en" srclang={self.quoteattr(source_lang)} datatype="plaintext"/>\n'
+            f'  <body>\n'
+        )
+        self.started = True
+    
+    def write(self, row):
+        tu_id, source_lang, target_lang, source, target = row
+        if not self.started:
+            self._start(source_lang)
+        quoteattr, escape = self.quoteattr, self.escape
+        tuid = f' tuid={quoteattr(tu_id)}' if tu_id else ''
+        self.file.write(
+            f'    <tu{tuid}>\n'
+            f'      <tuv xml:lang={quoteattr(source_lang)}><seg>{escape(source)}</seg></tuv>\n'
+            f'      <tuv xml:lang={quoteattr(target_lang)}><seg>{escape(target)}</seg></tuv>\n'
+            f'    </tu>\n'
+        )
+    
+    def close(self):
+        if not self.started:
+            self._start('*all*')
+        self.file.write('  </body>\n</tmx>\n')
+        self.file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path, batch_size):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        
+        self.pa = pa
+        self.schema = pa.schema([(column, pa.string()) for column in TRAINING_COLUMNS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.rows = []
+    
+    def _flush(self):
+        columns = list(zip(*self.rows))
+        arrays = [self.pa.array(column, type=self.pa.string()) for column in columns]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows = []
+    
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:  # One row group per batch keeps memory bounded
+            self._flush()
+    
+    def close(self):
+        if self.rows:
+            self._flush()
+        self.writer.close()
+
+
+EXPORT_WRITERS = {'tmx': _TMXWriter, 'tsv': _TSVWriter, 'parquet': _ParquetWriter}
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def _empty_percentages(empty_counts, total_counts):
+    """
+    Per-language empty segment counts and percentages, as reported by count_empty_segments
+    """
+    return {
+        lang: {
+            'empty_count': empty_counts[lang],
+            'total_count': total,
+            'empty_percentage': (empty_counts[lang] / total) * 100 if total > 0 else 0
+        }
+        for lang, total in total_counts.items()
+    }
+
+
+def _format_table(rows):
+    """
+    Right-aligned text table of dict rows (the layout of DataFrame.to_string(index=False))
+    
+    Matches pandas for int and string columns, including missing (None)
+    values; pandas would turn an int column with a None into floats.
+    """
+    columns = list(rows[0])
+    # pandas shows a missing value as NaN, unless the whole column is missing
+    missing = {column: "None" if all(row[column] is None for row in rows) else "NaN" for column in columns}
+    cells = [[missing[column] if row[column] is None else str(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+    # Numeric columns keep a leading space for the sign, as pandas does
+    widths = [width + all(isinstance(row[column], (int, float)) for row in rows)
+              for column, width in zip(columns, widths)]
+    lines = [columns] + cells
+    return "\n".join(" ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in lines)
+
+
 class TMXAnalyzer:
     def __init__(self, file_paths):
         """
@@ -15,6 +161,7 @@ class TMXAnalyzer:
         """
         self.file_paths = file_paths
         self.analysis_results = {}
+        self.cleaning_results = {}
         
     def analyze_all_files(self):
         """
@@ -32,12 +179,9 @@ class TMXAnalyzer:
                 encoding_info = self.check_encoding(file_path)
                 print(f"File encoding: {encoding_info['encoding']} (confidence: {encoding_info['confidence']:.2f})")
                 
-                # Parse TMX file
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                
-                # Extract translation data
-                translation_data = self.extract_translation_data(root)
+                # Stream the units instead of building the whole XML tree; medians
+                # and duplicate counts below still need every unit's text
+                translation_data = list(self.iter_translation_units(file_path))
                 
                 # Perform all analyses
                 results = {
@@ -67,6 +211,8 @@ class TMXAnalyzer:
         Check file encoding
         """
         try:
+            import chardet
+            
             with open(file_path, 'rb') as f:
                 raw_data = f.read(10000)  # Read first 10KB
                 result = chardet.detect(raw_data)
@@ -91,35 +237,63 @@ class TMXAnalyzer:
         translation_units = root.findall('.//tu')
         
         for tu in translation_units:
-            tu_data = {
-                'tu_id': tu.get('tuid', ''),
-                'segments': {}
-            }
-            
-            # Find all translation unit variants (tuvs)
-            tuvs = tu.findall('tuv')
+            translation_data.append(self._parse_tu(tu))
+        
+        return translation_data
+    
+    def _parse_tu(self, tu):
+        """
+        Extract the id and per-language segment text of one <tu> element
+        """
+        tu_data = {
+            'tu_id': tu.get('tuid', ''),
+            'segments': {}
+        }
+        
+        # Find all translation unit variants (tuvs)
+        tuvs = tu.findall('tuv')
+        
+        for tuv in tuvs:
+            # Get language
+            lang = (tuv.get('xml:lang') or 
+                   tuv.get('lang') or 
+                   tuv.get(XML_LANG) or 
+                   'unknown')
             
-            for tuv in tuvs:
-                # Get language
-                lang = (tuv.get('xml:lang') or 
-                       tuv.get('lang') or 
-                       tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or 
-                       'unknown')
-                
-                # Get text content
-                seg = tuv.find('seg')
-                if seg is not None:
-                    text = ''.join(seg.itertext()).strip()
-                    if not text:
-                        text = seg.text or ""
-                else:
-                    text = ""
-                
-                tu_data['segments'][lang] = text
+            # Get text content
+            seg = tuv.find('seg')
+            if seg is not None:
+                text = ''.join(seg.itertext()).strip()
+                if not text:
+                    text = seg.text or ""
+            else:
+                text = ""
             
-            translation_data.append(tu_data)
+            tu_data['segments'][lang] = text
         
-        return translation_data
+        return tu_data
+    
+    def iter_translation_units(self, file_path, header=None):
+        """
+        Stream translation units with iterparse, clearing each one once read
+        
+        Memory stays bounded by the largest unit rather than the file size.
+        If a dict is passed as header, it receives the <header> attributes.
+        """
+        body = None
+        for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == 'body':
+                    body = elem
+                continue
+            
+            if elem.tag == 'header' and header is not None:
+                header.update(elem.attrib)
+            elif elem.tag == 'tu':
+                yield self._parse_tu(elem)
+                elem.clear()
+                if body is not None:
+                    body.clear()  # Drop the finished unit from its parent too
     
     def get_basic_stats(self, translation_data):
         """
@@ -141,6 +315,8 @@ class TMXAnalyzer:
         """
         Analyze length ratios between source and target segments
         """
+        import numpy as np
+        
         ratios = defaultdict(list)
         char_lengths = defaultdict(list)
         word_lengths = defaultdict(list)
@@ -233,16 +409,7 @@ class TMXAnalyzer:
                 if not text or not text.strip():
                     empty_counts[lang] += 1
         
-        # Calculate percentages
-        empty_percentages = {}
-        for lang in total_counts:
-            empty_percentages[lang] = {
-                'empty_count': empty_counts[lang],
-                'total_count': total_counts[lang],
-                'empty_percentage': (empty_counts[lang] / total_counts[lang]) * 100 if total_counts[lang] > 0 else 0
-            }
-        
-        return empty_percentages
+        return _empty_percentages(empty_counts, total_counts)
     
     def detect_duplicates(self, translation_data):
         """
@@ -302,6 +469,223 @@ class TMXAnalyzer:
         
         return dict(language_pair_matrix)
     
+    def clean_and_export(self, file_path, output_path, output_format=None, source_lang=None,
+                         max_ratio_z=3.0, min_ratio_samples=200, batch_size=50000):
+        """
+        Stream a TMX file once, analyzing it and writing a cleaned source/target training set
+        
+        Drops pairs with an empty side, duplicate (source, target) pairs and
+        character length-ratio outliers more than max_ratio_z standard
+        deviations from the mean of their language pair. Duplicates are
+        tracked as 8-byte digests, so memory grows with the number of unique
+        pairs, not with their text.
+        
+        The same pass gathers the statistics that can be kept in bounded
+        memory (units, languages, empty segments, language pair completeness
+        and running length ratios) into results['analysis']. Ratio medians,
+        duplicate frequencies and the most common source language need every
+        unit, so they come only from analyze_all_files(), which is a separate
+        pass that holds the parsed units in memory. When the file has been
+        analyzed that way, its per-pair ratio mean and deviation are used for
+        filtering; otherwise running estimates are, and ratio filtering of a
+        pair starts once it has min_ratio_samples samples.
+        results['ratio_stats'][pair]['source'] says which one each pair used.
+        
+        output_format: 'tmx', 'tsv' or 'parquet' (default: output_path suffix)
+        source_lang: defaults to the header srclang, else the file's most
+        common language; every unit uses the same one, see _file_source_lang()
+        """
+        output_format = (output_format or Path(output_path).suffix.lstrip('.')).lower()
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{output_format}', expected one of {EXPORT_FORMATS}")
+        
+        analyzed = self.analysis_results.get(file_path, {}).get('length_ratios', {})
+        known_ratios = analyzed.get('character_ratios', {}) if 'error' not in analyzed else {}
+        
+        file_source = self._file_source_lang(file_path, source_lang)
+        seen = set()
+        running = defaultdict(RunningStats)
+        counts = Counter()
+        segment_counts = Counter()
+        empty_counts = Counter()
+        language_pairs = Counter()
+        writer = EXPORT_WRITERS[output_format](output_path, batch_size)
+        
+        try:
+            for tu in self.iter_translation_units(file_path):
+                counts['units'] += 1
+                segments = tu['segments']
+                if not segments:
+                    continue
+                
+                # Bounded-memory analysis of the same unit
+                languages = []
+                for lang, text in segments.items():
+                    segment_counts[lang] += 1
+                    if text.strip():
+                        languages.append(lang)
+                    else:
+                        empty_counts[lang] += 1
+                for i, lang1 in enumerate(languages):
+                    for lang2 in languages[i+1:]:
+                        language_pairs[f"{lang1}<->{lang2}"] += 1
+                
+                source = self._pick_source_lang(segments, file_source)
+                source_text = segments[source].strip() if source else ""  # No source: every pair is empty
+                
+                for lang, text in segments.items():
+                    if lang == source:
+                        continue
+                    counts['pairs'] += 1
+                    target_text = text.strip()
+                    
+                    if not source_text or not target_text:
+                        counts['dropped_empty'] += 1
+                        continue
+                    
+                    digest = hashlib.blake2b(
+                        f"{file_source}\0{lang}\0{source_text.lower()}\0{target_text.lower()}".encode('utf-8'),
+                        digest_size=8
+                    ).digest()
+                    if digest in seen:
+                        counts['dropped_duplicate'] += 1
+                        continue
+                    seen.add(digest)
+                    
+                    pair = f"{file_source}->{lang}"
+                    ratio = len(target_text) / len(source_text)
+                    estimate = running[pair]
+                    if pair in known_ratios:
+                        mean, std, ready = known_ratios[pair]['mean_ratio'], known_ratios[pair]['std_ratio'], True
+                    else:
+                        mean, std, ready = estimate.mean, estimate.std, estimate.count >= min_ratio_samples
+                    estimate.update(ratio)
+                    
+                    if ready and std > 0 and abs(ratio - mean) / std > max_ratio_z:
+                        counts['dropped_ratio'] += 1
+                        continue
+                    
+                    writer.write((tu['tu_id'], file_source, lang, source_text, target_text))
+                    counts['kept'] += 1
+        finally:
+            writer.close()
+        
+        ratio_stats = {}
+        for pair, stats in running.items():
+            if pair in known_ratios:
+                mean, std, source = known_ratios[pair]['mean_ratio'], known_ratios[pair]['std_ratio'], 'analysis'
+            else:
+                mean, std, source = stats.mean, stats.std, 'running'
+            ratio_stats[pair] = {'mean_ratio': mean, 'std_ratio': std, 'count': stats.count, 'source': source}
+        
+        results = {
+            'file_path': file_path,
+            'output_path': output_path,
+            'output_format': output_format,
+            'source_language': file_source,
+            'counts': dict(counts),
+            'ratio_stats': ratio_stats,
+            'analysis': {
+                'basic_stats': {
+                    'total_translation_units': counts['units'],
+                    'languages_found': sorted(segment_counts),
+                    'language_count': len(segment_counts)
+                },
+                'empty_segments': _empty_percentages(empty_counts, segment_counts),
+                'language_pairs': dict(language_pairs)
+            }
+        }
+        self.cleaning_results[file_path] = results
+        self.print_cleaning_summary(results)
+        return results
+    
+    def _file_source_lang(self, file_path, preferred=None):
+        """
+        The one source language used for every unit of a file
+        
+        preferred, else the header srclang, else - for srclang "*all*" or no
+        header - the language with the most non-empty segments, the same rule
+        analyze_length_ratios() uses. That comes from analyze_all_files() when
+        the file has been analyzed, otherwise from a streaming pre-pass.
+        """
+        if preferred:
+            return preferred
+        
+        header = {}
+        with open(file_path, 'rb') as f:
+            for event, elem in ET.iterparse(f, events=('end',)):
+                if elem.tag == 'header':
+                    header.update(elem.attrib)
+                    break
+                if elem.tag == 'tu':
+                    break
+        srclang = header.get('srclang')
+        if srclang and srclang.lower() != '*all*':
+            return srclang
+        
+        analyzed = self.analysis_results.get(file_path, {}).get('length_ratios', {})
+        if analyzed.get('source_language'):
+            return analyzed['source_language']
+        
+        lang_counts = Counter()
+        for tu in self.iter_translation_units(file_path):
+            for lang, text in tu['segments'].items():
+                if text.strip():
+                    lang_counts[lang] += 1
+        if not lang_counts:
+            return None
+        return lang_counts.most_common(1)[0][0]
+    
+    def _pick_source_lang(self, segments, source_lang):
+        """
+        The unit's key for source_lang (matched case-insensitively), or None if it lacks one
+        """
+        if source_lang in segments or not source_lang:
+            return source_lang or None
+        source_lower = source_lang.lower()
+        for lang in segments:
+            if lang.lower() == source_lower:
+                return lang
+        return None
+    
+    def clean_all_files(self, output_dir, output_format='tsv', **options):
+        """
+        Clean and export every file, one output per input named after it
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        for file_path in self.file_paths:
+            output_path = output_dir / f"{Path(file_path).stem}.clean.{output_format}"
+            try:
+                self.clean_and_export(file_path, str(output_path), output_format, **options)
+            except Exception as e:
+                print(f"ERROR cleaning {file_path}: {str(e)}")
+                continue
+        
+        return self.cleaning_results
+    
+    def print_cleaning_summary(self, results):
+        """
+        Print what the cleaning pass kept and dropped
+        """
+        counts = results['counts']
+        pairs = counts.get('pairs', 0)
+        
+        def share(key):
+            return (counts.get(key, 0) / pairs) * 100 if pairs else 0
+        
+        print(f"\n🧹 CLEANED {Path(results['file_path']).name} -> {results['output_path']}:")
+        print(f"  • Translation units read: {counts.get('units', 0):,}")
+        print(f"  • Source language: {results['source_language']}")
+        print(f"  • Pairs kept: {counts.get('kept', 0):,} / {pairs:,} ({share('kept'):.1f}%)")
+        print(f"  • Dropped empty: {counts.get('dropped_empty', 0):,} ({share('dropped_empty'):.1f}%)")
+        print(f"  • Dropped duplicate: {counts.get('dropped_duplicate', 0):,} ({share('dropped_duplicate'):.1f}%)")
+        print(f"  • Dropped length-ratio outliers: {counts.get('dropped_ratio', 0):,} ({share('dropped_ratio'):.1f}%)")
+        for pair, stats in results['ratio_stats'].items():
+            print(f"    - {pair}: mean {stats['mean_ratio']:.2f}, std {stats['std_ratio']:.2f} "
+                  f"({stats['source']} statistics, {stats['count']:,} samples)")
+    
     def print_file_analysis(self, results):
         """
         Print analysis results for a single file
@@ -366,10 +750,10 @@ class TMXAnalyzer:
             
             # Calculate quality scores
             empty_scores = results['empty_segments']
-            avg_empty_rate = np.mean([data['empty_percentage'] for data in empty_scores.values()])
+            avg_empty_rate = _mean([data['empty_percentage'] for data in empty_scores.values()])
             
             duplicate_scores = results['duplicates']
-            avg_duplicate_rate = np.mean([data['duplicate_percentage'] for data in duplicate_scores.values()])
+            avg_duplicate_rate = _mean([data['duplicate_percentage'] for data in duplicate_scores.values()])
             
             comparison_data.append({
                 'File': file_name,
@@ -383,12 +767,11 @@ class TMXAnalyzer:
         
         # Print comparison table
         if comparison_data:
-            df = pd.DataFrame(comparison_data)
-            print(df.to_string(index=False))
+            print(_format_table(comparison_data))
             
             # Training recommendations
             print(f"\n📋 TRAINING RECOMMENDATIONS:")
-            for i, row in df.iterrows():
+            for row in comparison_data:
                 file_name = row['File']
                 tu_count = row['Translation Units']
                 empty_rate = float(row['Avg Empty Rate (%)'])
@@ -425,6 +808,7 @@ class TMXAnalyzer:
                         print(f"      - Remove empty segments")
                     if duplicate_rate > 20:
                         print(f"      - Deduplicate content")
+                    print(f"      - Both in one pass: analyzer.clean_and_export(path, 'clean.tsv')")
 
 # Usage example
 def main():
@@ -0,0 +1,176 @@
+# Vector Compression Options
+# Truncated-dimension embeddings and scalar/binary quantization settings for content_vector
+
+import math
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+NATIVE_EMBEDDING_DIMENSIONS = 3072  # text-embedding-3-large
+COMPRESSION_KINDS = (None, "scalar", "binary")
+
+
+class VectorCompressionConfig(NamedTuple):
+    """How content_vector is stored and searched
+
+    dimensions: embedding size kept after truncation (text-embedding-3-large
+        supports shortened embeddings, renormalized after truncation)
+    compression: None, "scalar" (int8) or "binary" quantization
+    rescore: rescore the oversampled quantized candidates with full-precision vectors
+    oversampling: candidates fetched per requested neighbour before rescoring
+    store_original_vector: keep a retrievable copy of the raw vector (stored=True)
+    """
+    dimensions: int = 1536
+    compression: Optional[str] = None
+    rescore: bool = True
+    oversampling: float = 4.0
+    store_original_vector: bool = True
+
+
+def validate_config(config: VectorCompressionConfig) -> VectorCompressionConfig:
+    if config.compression not in COMPRESSION_KINDS:
+        raise ValueError(f"Unknown compression '{config.compression}', expected one of {COMPRESSION_KINDS}")
+    if not 0 < config.dimensions <= NATIVE_EMBEDDING_DIMENSIONS:
+        raise ValueError(f"dimensions must be between 1 and {NATIVE_EMBEDDING_DIMENSIONS}")
+    if config.oversampling < 1:
+        raise ValueError("oversampling must be >= 1")
+    return config
+
+
+def truncate_embedding(embedding: List[float], dimensions: int) -> List[float]:
+    """Keep the first `dimensions` values and L2-renormalize"""
+    if len(embedding) < dimensions:
+        raise ValueError(f"Embedding has {len(embedding)} dimensions, fewer than the {dimensions} indexed")
+    if len(embedding) == dimensions:
+        return embedding
+    truncated = embedding[:dimensions]
+    norm = math.sqrt(sum(value * value for value in truncated)) or 1.0
+    return [value / norm for value in truncated]
+
+
+def _normalize(np, matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _top_k(np, scores, k):
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _rescore(np, candidates, queries, vectors, k):
+    """Re-rank candidate rows with full-precision dot products"""
+    exact = np.einsum("qd,qcd->qc", queries, vectors[candidates])
+    order = np.argsort(-exact, axis=1)[:, :k]
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class CompressedVectorSet:
+    """Simulates the index's quantized vector storage and search in NumPy"""
+
+    def __init__(self, vectors, config: VectorCompressionConfig):
+        import numpy as np
+
+        self.np = np
+        self.config = validate_config(config)
+        self.vectors = _normalize(np, np.asarray(vectors)[:, :config.dimensions].astype(np.float32))
+
+        if config.compression == "scalar":
+            low, high = self.vectors.min(axis=0), self.vectors.max(axis=0)
+            scale = np.where(high > low, (high - low) / 255.0, 1.0)
+            codes = np.round((self.vectors - low) / scale).astype(np.uint8)
+            self.decoded = codes.astype(np.float32) * scale + low
+            self.bytes_per_vector = codes.shape[1]
+        elif config.compression == "binary":
+            self.bits = np.packbits(self.vectors > 0, axis=1)
+            self.popcount = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint16)
+            self.bytes_per_vector = self.bits.shape[1]
+        else:
+            self.bytes_per_vector = self.vectors.shape[1] * 4
+
+    def search(self, queries, k: int):
+        """Return the (queries x k) nearest rows, rescoring oversampled candidates if enabled"""
+        np, config = self.np, self.config
+        queries = _normalize(np, np.asarray(queries)[:, :config.dimensions].astype(np.float32))
+        fetch = k
+        if config.rescore and config.compression is not None:
+            fetch = min(len(self.vectors), int(math.ceil(k * config.oversampling)))
+
+        if config.compression is None:
+            return _top_k(np, queries @ self.vectors.T, k)
+
+        if config.compression == "scalar":
+            candidates = _top_k(np, queries @ self.decoded.T, fetch)
+        else:
+            query_bits = np.packbits(queries > 0, axis=1)
+            hamming = np.empty((len(queries), len(self.bits)), dtype=np.uint16)
+            for start in range(0, len(queries), 8):  # Bounded XOR buffer
+                block = query_bits[start:start + 8, None, :] ^ self.bits[None, :, :]
+                hamming[start:start + 8] = self.popcount[block].sum(axis=2)
+            candidates = _top_k(np, -hamming.astype(np.float32), fetch)
+
+        if config.rescore:
+            candidates = _rescore(np, candidates, queries, self.vectors, k)
+        return candidates[:, :k]
+
+
+def benchmark_compression(
+    vectors=None,
+    queries=None,
+    k: int = 10,
+    dimensions: List[int] = (3072, 1536, 1024, 512, 256),
+    oversampling: float = 4.0
+) -> List[Dict[str, float]]:
+    """Compare recall@k, latency and storage of dimension/compression settings
+
+    vectors/queries: arrays of full-size embeddings, or .npy paths to them
+    (a sample of the production corpus gives the only meaningful recall numbers).
+    Ground truth is exact search on the untruncated float32 vectors; latency
+    covers search only, not encoding the corpus.
+    """
+    import numpy as np
+
+    if isinstance(vectors, str):
+        vectors = np.load(vectors)
+    if isinstance(queries, str):
+        queries = np.load(queries)
+    if vectors is None:
+        rng = np.random.default_rng(3)
+        # Decaying per-dimension variance mimics embeddings trained for truncation
+        decay = np.exp(-np.arange(NATIVE_EMBEDDING_DIMENSIONS) / 800.0).astype(np.float32)
+        vectors = rng.normal(size=(10000, NATIVE_EMBEDDING_DIMENSIONS)).astype(np.float32) * decay
+        queries = vectors[rng.choice(len(vectors), 100, replace=False)] + 0.3 * decay * rng.normal(
+            size=(100, NATIVE_EMBEDDING_DIMENSIONS)).astype(np.float32)
+    elif queries is None:
+        queries = vectors[:100]
+
+    exact = CompressedVectorSet(vectors, VectorCompressionConfig(dimensions=vectors.shape[1])).search(queries, k)
+
+    print(f"{'dims':>6} {'compression':>12} {'rescore':>8} {'recall@' + str(k):>10} {'ms/query':>9} {'bytes/vec':>10}")
+    rows = []
+    for dims in dimensions:
+        if dims > vectors.shape[1]:
+            continue
+        for compression in COMPRESSION_KINDS:
+            for rescore in ((False,) if compression is None else (False, True)):
+                vector_set = CompressedVectorSet(vectors, VectorCompressionConfig(dims, compression, rescore, oversampling))
+                stored_bytes = vector_set.bytes_per_vector
+                start = time.perf_counter()
+                found = vector_set.search(queries, k)
+                elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+                recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(found.tolist(), exact.tolist())])
+
+                rows.append({
+                    "dimensions": dims,
+                    "compression": compression or "none",
+                    "rescore": rescore,
+                    "recall": float(recall),
+                    "ms_per_query": elapsed_ms,
+                    "bytes_per_vector": stored_bytes
+                })
+                print(f"{dims:>6} {compression or 'none':>12} {str(rescore):>8} {recall:>10.3f} {elapsed_ms:>9.2f} {stored_bytes:>10}")
+    return rows
+
+
+if __name__ == "__main__":
+    benchmark_compression()